@@ -0,0 +1,128 @@
+"""A+ content export: every module image size plus the copy, as a streamed ZIP.
+
+The processed image is decoded once, then each module size is rendered in a
+worker thread (bounded by `concurrency`). Entries go into the archive in the
+order they finish, and each one's bytes are yielded as soon as it's written,
+so the client starts receiving the ZIP while later sizes are still rendering.
+Nothing touches disk, and memory holds the source image plus at most
+`concurrency` rendered entries, never the whole archive.
+"""
+import asyncio
+import io
+import json
+import time
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# (file stem, width, height) of the Amazon A+ module images
+APLUS_MODULES = (
+    ("company_logo", 600, 180),
+    ("image_header_with_text", 970, 600),
+    ("premium_full_image", 1464, 600),
+    ("image_text_overlay", 970, 300),
+    ("single_image_sidebar", 300, 400),
+    ("single_image_highlights", 300, 300),
+    ("single_image_specs", 300, 300),
+    ("three_image_text", 300, 300),
+    ("four_image_text", 220, 220),
+    ("comparison_chart", 150, 300),
+)
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable sink for ZipFile; zipfile then writes data descriptors and never seeks back"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def load_source(path: Path, max_side: int) -> "Image.Image":
+    """Decode the processed image once, shrunk to the largest module size needed"""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img.draft("RGB", (max_side, max_side))
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha else "RGB")
+    img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    return img
+
+
+def render_module(img: "Image.Image", width: int, height: int) -> Tuple[bytes, str]:
+    """Fit the product inside width x height without cropping; returns (data, extension)"""
+    from PIL import Image, ImageOps
+
+    # Cut-outs get transparent padding, photos a white one
+    has_alpha = img.mode == "RGBA"
+    fitted = ImageOps.pad(img, (width, height), Image.Resampling.LANCZOS, color=(255, 255, 255, 0) if has_alpha else (255, 255, 255))
+    out = io.BytesIO()
+    if has_alpha:
+        fitted.save(out, "PNG", optimize=True)
+        return out.getvalue(), "png"
+    fitted.save(out, "JPEG", quality=90, optimize=True)
+    return out.getvalue(), "jpg"
+
+
+async def stream_export(source_path: Path, title: Optional[str], description: Optional[str], concurrency: int = 4,
+                        observe: Optional[Callable[[str, float, Tuple[int, int]], None]] = None) -> AsyncIterator[bytes]:
+    """Yield the ZIP archive in chunks; observe(op, started, size) is called per rendered module"""
+    max_side = max(max(w, h) for _, w, h in APLUS_MODULES)
+    started = time.perf_counter()
+    img = await asyncio.to_thread(load_source, source_path, max_side)
+    if observe:
+        observe("export_decode", started, img.size)
+
+    sink = _ZipSink()
+    archive = zipfile.ZipFile(sink, "w")
+    date_time = time.localtime()[:6]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def render(name: str, width: int, height: int):
+        async with semaphore:
+            begun = time.perf_counter()
+            data, extension = await asyncio.to_thread(render_module, img, width, height)
+            if observe:
+                observe("export_module", begun, (width, height))
+            return f"images/{name}_{width}x{height}.{extension}", data
+
+    tasks = [asyncio.create_task(render(name, w, h)) for name, w, h in APLUS_MODULES]
+    try:
+        files = []
+        for finished in asyncio.as_completed(tasks):
+            filename, data = await finished
+            # Images are already compressed; storing them keeps the CPU for rendering
+            archive.writestr(zipfile.ZipInfo(filename, date_time), data, compress_type=zipfile.ZIP_STORED)
+            files.append(filename)
+            yield sink.drain()
+
+        copy = f"{title or ''}\n\n{description or ''}\n"
+        archive.writestr(zipfile.ZipInfo("content.txt", date_time), copy, compress_type=zipfile.ZIP_DEFLATED)
+        manifest = {
+            "title": title,
+            "description": description,
+            "modules": [{"module": name, "width": w, "height": h} for name, w, h in APLUS_MODULES],
+            "files": sorted(files),
+        }
+        archive.writestr(zipfile.ZipInfo("manifest.json", date_time), json.dumps(manifest, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+        archive.close()
+        yield sink.drain()
+    finally:
+        # The client went away mid-stream: don't keep rendering for nobody
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,134 @@
+"""JWT verification with a verified-token cache and an in-memory revocation list.
+
+Verifying a token means an HMAC check plus claim validation; doing that on
+every request is wasted work for a token we already accepted. TokenCache keeps
+recently verified tokens in a bounded LRU until their `exp`, so the common
+path is a dict lookup. RevocationList holds revoked token ids and per-user
+"revoked before" cut-offs in memory; it is loaded from and written through to
+the database by the server, so checking it never needs a query.
+"""
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import jwt
+
+AUTH_TOKEN_CACHE_SIZE = int(os.environ.get('AUTH_TOKEN_CACHE_SIZE', '10000'))
+
+
+@dataclass(frozen=True)
+class UserContext:
+    user_id: str
+    email: Optional[str]
+    token_id: str
+    issued_at: float
+    expires_at: float
+
+
+class TokenCache:
+    """Bounded LRU of token -> UserContext, entries dropped once expired"""
+
+    def __init__(self, maxsize: int = AUTH_TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, UserContext]" = OrderedDict()
+
+    def get(self, token: str, now: float) -> Optional[UserContext]:
+        user = self._entries.get(token)
+        if user is None:
+            return None
+        if user.expires_at <= now:
+            del self._entries[token]
+            return None
+        self._entries.move_to_end(token)
+        return user
+
+    def put(self, token: str, user: UserContext):
+        self._entries[token] = user
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard_user(self, user_id: str):
+        for token in [t for t, u in self._entries.items() if u.user_id == user_id]:
+            del self._entries[token]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RevocationList:
+    """Revoked token ids (kept until they would have expired) and per-user cut-offs"""
+
+    def __init__(self):
+        self._tokens: Dict[str, float] = {}
+        self._users: Dict[str, float] = {}
+
+    def revoke_token(self, token_id: str, expires_at: float):
+        self._tokens[token_id] = expires_at
+
+    def revoke_user(self, user_id: str, revoked_before: float):
+        self._users[user_id] = max(revoked_before, self._users.get(user_id, 0))
+
+    def is_revoked(self, user: UserContext) -> bool:
+        if user.token_id in self._tokens:
+            return True
+        # iat has whole-second resolution, so the cut-off is a whole second and a
+        # token issued in that same second (a fresh login) stays valid
+        cutoff = self._users.get(user.user_id)
+        return cutoff is not None and user.issued_at < cutoff
+
+    def prune(self, now: float):
+        for token_id in [t for t, exp in self._tokens.items() if exp <= now]:
+            del self._tokens[token_id]
+
+    def __len__(self):
+        return len(self._tokens) + len(self._users)
+
+
+class InvalidToken(Exception):
+    pass
+
+
+class Authenticator:
+    def __init__(self, secret: str, algorithm: str, cache: Optional[TokenCache] = None):
+        self.secret = secret
+        self.algorithm = algorithm
+        self.cache = cache or TokenCache()
+        self.revocations = RevocationList()
+
+    def decode(self, token: str) -> UserContext:
+        try:
+            payload = jwt.decode(token, self.secret, algorithms=[self.algorithm])
+        except jwt.PyJWTError:
+            raise InvalidToken()
+        user_id = payload.get("user_id")
+        if not user_id or "exp" not in payload:
+            raise InvalidToken()
+        return UserContext(
+            user_id=user_id,
+            email=payload.get("email"),
+            # Tokens issued before jti was added can only be revoked per user
+            token_id=payload.get("jti") or "",
+            issued_at=float(payload.get("iat", 0)),
+            expires_at=float(payload["exp"]),
+        )
+
+    def authenticate(self, token: str) -> Optional[UserContext]:
+        """Return the cached context, or None when the token still needs a full check"""
+        user = self.cache.get(token, time.time())
+        if user is None:
+            return None
+        if self.revocations.is_revoked(user):
+            raise InvalidToken()
+        return user
+
+    def verify(self, token: str) -> UserContext:
+        user = self.decode(token)
+        if self.revocations.is_revoked(user):
+            raise InvalidToken()
+        return user
+
+    def remember(self, token: str, user: UserContext):
+        self.cache.put(token, user)
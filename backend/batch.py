@@ -0,0 +1,65 @@
+"""Rate-limit-aware scheduling for batch content generation.
+
+Providers enforce requests-per-minute and tokens-per-minute limits per API
+key. RateBudget holds one token bucket for each, shared by every batch job in
+the process, so concurrent calls are paced under both limits instead of
+tripping 429s. A call reserves its estimated token cost up front and settles
+the difference once the provider reports actual usage.
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text is close enough for pacing
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        # Requests larger than the whole bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+
+class RateBudget:
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self, estimated_tokens: int):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # Serialize waiters so reservations are granted in arrival order
+        async with self._lock:
+            while True:
+                delay = max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+            self.requests.take(1)
+            self.tokens.take(estimated_tokens)
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        if actual_tokens:
+            self.tokens.take(actual_tokens - estimated_tokens)
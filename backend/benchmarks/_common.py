@@ -0,0 +1,96 @@
+"""Helpers shared by the benchmark scripts."""
+import os
+import random
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from pathlib import Path
+from typing import Iterable
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def use_backend():
+    """Make the backend importable and, unless DATABASE_URL is set, point it at a throwaway SQLite file.
+
+    Call it before importing server, which connects at import time.
+    """
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(q * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def latency_summary(latencies: Iterable[float]) -> dict:
+    """p50/p95/p99/max of latencies given in seconds, in milliseconds"""
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+    }
+
+
+def make_image(width: int = 800, height: int = 800, fmt: str = "JPEG", mode: str = "RGB") -> bytes:
+    """Product on a near-white studio background, with sensor noise so it compresses like a photo"""
+    from PIL import Image, ImageDraw, ImageFilter
+
+    rng = random.Random(0)
+    noise = Image.frombytes("L", (width // 4, height // 4), rng.randbytes(width // 4 * height // 4))
+    noise = noise.resize((width, height), Image.Resampling.BILINEAR).point(lambda v: 235 + v // 16)
+    img = Image.merge("RGB", (noise, noise, noise))
+    draw = ImageDraw.Draw(img)
+    draw.rounded_rectangle((width // 4, height // 8, width * 3 // 4, height * 7 // 8), radius=width // 10, fill=(40, 90, 160))
+    draw.ellipse((width * 3 // 8, height // 4, width * 5 // 8, height // 2), fill=(230, 180, 40))
+    img = img.filter(ImageFilter.GaussianBlur(1))
+    if mode == "RGBA":
+        mask = Image.new("L", (width, height), 0)
+        ImageDraw.Draw(mask).ellipse((width // 10, height // 20, width * 9 // 10, height * 19 // 20), fill=255)
+        img.putalpha(mask)
+
+    out = BytesIO()
+    if fmt == "JPEG":
+        img.save(out, "JPEG", quality=90)
+    else:
+        img.save(out, "PNG")
+    return out.getvalue()
+
+
+def seed_projects(user_id: str, count: int, title: str, description: str) -> list:
+    """Insert count projects with generated copy for user_id; returns their ids, newest first"""
+    from server import ProjectDB, SessionLocal
+
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        ids = [str(uuid.uuid4()) for _ in range(count)]
+        db.bulk_insert_mappings(ProjectDB, [
+            {
+                "id": project_id,
+                "user_id": user_id,
+                "name": f"Bench project {i}",
+                "original_image_path": f"/uploads/{user_id}_original_{project_id}.jpg",
+                "processed_image_path": f"/uploads/{user_id}_processed_{project_id}.png",
+                "ai_title": title,
+                "ai_description": description,
+                "created_at": now - timedelta(seconds=i),
+                "updated_at": now,
+            }
+            for i, project_id in enumerate(ids)
+        ])
+        db.commit()
+        return ids
+    finally:
+        db.close()
@@ -0,0 +1,221 @@
+"""Image-operation microbenchmarks with regression thresholds.
+
+Runs the code paths behind the image endpoints on synthetic product shots:
+
+- save_uploaded_file: stream the encoded upload to the uploads directory
+- remove_background: decode, image_ops.remove_white_background, save as PNG
+- enhance_image: decode, image_ops.upscale (2x), save as PNG
+- save_processed_image: PNG-encode an already decoded image
+
+over a JPEG photo, an RGBA PNG cut-out and a large RGBA PNG. It reports wall
+time (best of --repeat), peak memory and output bytes for each op and input.
+Wall time is also reported relative to a fixed calibration workload (decode,
+resample and encode an image, plus a pure-Python loop), timed alongside each
+repetition in the same process, and that ratio is what gets compared.
+Every op and input pair runs in a fresh process, so peak memory is the growth
+of the process's max RSS during the op. Pillow's buffers are allocated outside
+the Python heap, so tracemalloc alone would miss them. The Python heap peak is
+reported too.
+
+Results are compared with benchmarks/baselines/image_ops.json. The run fails,
+exiting with status 1, when any op is slower, uses more memory or writes more
+bytes than its baseline by more than --tolerance. Relative times carry over
+between machines of different speed, so the committed baseline is usable as
+is; refresh it with --update-baseline after an intended change.
+
+    python benchmarks/bench_image_ops.py [--cases jpeg_photo,png_alpha,rgba_large] [--repeat 5]
+                                         [--tolerance 0.5] [--update-baseline] [--json]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue as queue_module
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+from pathlib import Path
+
+from _common import make_image
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "image_ops.json"
+
+# name: (width, height, format, mode)
+CASES = {
+    "jpeg_photo": (1600, 1200, "JPEG", "RGB"),
+    "png_alpha": (1200, 1200, "PNG", "RGBA"),
+    "rgba_large": (2400, 2400, "PNG", "RGBA"),
+}
+OPS = ("save_uploaded_file", "remove_background", "enhance_image", "save_processed_image")
+# Compared against the baseline; "relative" is ms divided by the calibration time
+METRICS = ("relative", "peak_mb", "output_bytes")
+# Absolute slack so tiny values don't trip the relative tolerance on noise; time in ms
+NOISE_FLOOR = {"ms": 5.0, "peak_mb": 2.0, "output_bytes": 1024}
+
+
+def run_op(op: str, source: Path, encoded: bytes, decoded, upload_dir: Path):
+    """One op exactly as its endpoint runs it, minus the database; returns the written path"""
+    from PIL import Image
+    from starlette.datastructures import UploadFile
+
+    import server
+    from image_ops import remove_white_background, upscale
+
+    if op == "save_uploaded_file":
+        url = server.save_uploaded_file(UploadFile(BytesIO(encoded), filename=source.name), "bench", "original")
+    elif op == "remove_background":
+        url = server.save_processed_image(remove_white_background(Image.open(source)), "bench", "nobg")
+    elif op == "enhance_image":
+        url = server.save_processed_image(upscale(Image.open(source), 2), "bench", "enhanced")
+    else:
+        url = server.save_processed_image(decoded, "bench", "processed")
+    return upload_dir / Path(url).name
+
+
+def calibrate(encoded: bytes) -> float:
+    """Seconds for a fixed workload shaped like the ops: Pillow decode, resample and encode, plus a Python loop"""
+    from PIL import Image
+
+    started = time.perf_counter()
+    img = Image.open(BytesIO(encoded)).convert("RGBA")
+    img = img.resize((1200, 1200), Image.Resampling.LANCZOS)
+    img.save(BytesIO(), "PNG")
+    sum(r + g + b for r, g, b, _ in img.resize((300, 300)).getdata())
+    return time.perf_counter() - started
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def measure_in_child(op: str, case: str, repeat: int, queue):
+    workdir = Path(tempfile.mkdtemp(prefix="bench-image-ops-"))
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    import logging
+    logging.disable(logging.WARNING)
+
+    import server
+    from PIL import Image
+
+    server.UPLOAD_DIR = workdir
+    width, height, fmt, mode = CASES[case]
+    encoded = make_image(width, height, fmt, mode)
+    source = workdir / f"source.{'jpg' if fmt == 'JPEG' else 'png'}"
+    source.write_bytes(encoded)
+    decoded = None
+    if op == "save_processed_image":
+        decoded = Image.open(source)
+        decoded.load()
+
+    # Once before measuring memory, so its buffers count towards the starting RSS
+    calibration_input = make_image(600, 600, "JPEG", "RGB")
+    calibrate(calibration_input)
+    timings, calibrations, output_bytes, heap_peak = [], [], 0, 0
+    rss_before = max_rss_mb()
+    for _ in range(repeat):
+        # Right next to the op, so both see the machine in the same state; untraced, so
+        # its allocations stay out of the heap peak
+        calibrations.append(calibrate(calibration_input))
+        tracemalloc.start()
+        started = time.perf_counter()
+        written = run_op(op, source, encoded, decoded, workdir)
+        timings.append(time.perf_counter() - started)
+        heap_peak = max(heap_peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        output_bytes = written.stat().st_size
+        written.unlink()
+
+    ms, calibration_ms = min(timings) * 1000, min(calibrations) * 1000
+    queue.put({
+        "ms": round(ms, 1),
+        "calibration_ms": round(calibration_ms, 1),
+        "relative": round(ms / calibration_ms, 4),
+        "peak_mb": round(max(0.0, max_rss_mb() - rss_before), 1),
+        "heap_peak_mb": round(heap_peak / 1024 / 1024, 1),
+        "output_bytes": output_bytes,
+        "input": f"{width}x{height} {fmt} {mode}, {len(encoded)} bytes",
+    })
+
+
+def measure(op: str, case: str, repeat: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=measure_in_child, args=(op, case, repeat, queue))
+    process.start()
+    while True:
+        try:
+            result = queue.get(timeout=1.0)
+            break
+        except queue_module.Empty:
+            if not process.is_alive():
+                raise RuntimeError(f"{case}/{op} exited with status {process.exitcode}")
+    process.join()
+    return result
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    found = []
+    for case, ops in results.items():
+        for op, current in ops.items():
+            expected = baseline.get(case, {}).get(op)
+            if expected is None:
+                continue
+            floor = {**NOISE_FLOOR, "relative": NOISE_FLOOR["ms"] / current["calibration_ms"]}
+            for metric in METRICS:
+                if metric not in expected:
+                    continue
+                limit = max(expected[metric] * (1 + tolerance), expected[metric] + floor[metric])
+                if current[metric] > limit:
+                    found.append(f"{case}/{op}: {metric} {current[metric]} > {expected[metric]} (+{tolerance:.0%})")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated, from: " + ", ".join(CASES))
+    parser.add_argument("--ops", default=",".join(OPS), help="comma-separated, from: " + ", ".join(OPS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative regression per metric")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = {}
+    for case in args.cases.split(","):
+        results[case] = {op: measure(op, case, args.repeat) for op in args.ops.split(",")}
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text())["results"] if baseline_path.is_file() else {}
+    failed = [] if args.update_baseline else regressions(results, baseline, args.tolerance)
+
+    if args.json:
+        print(json.dumps({"results": results, "regressions": failed}, indent=2))
+    else:
+        print(f"\n{'case':<12} {'op':<22} {'ms':>9} {'relative':>9} {'baseline':>9} {'peak MB':>9} {'heap MB':>9} {'output bytes':>14}")
+        print("-" * 101)
+        for case, ops in results.items():
+            for op, r in ops.items():
+                expected = baseline.get(case, {}).get(op, {}).get("relative", "-")
+                print(f"{case:<12} {op:<22} {r['ms']:>9} {r['relative']:>9} {expected:>9} {r['peak_mb']:>9} {r['heap_peak_mb']:>9} {r['output_bytes']:>14,}")
+        for line in failed:
+            print(f"REGRESSION {line}")
+
+    if args.update_baseline:
+        merged = {**baseline, **{case: {**baseline.get(case, {}), **ops} for case, ops in results.items()}}
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps({"repeat": args.repeat, "results": merged}, indent=2) + "\n")
+        print(f"baseline written to {baseline_path}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Exercise llm_client.LLMClient against the local mock LLM server.
+
+Checks that completions don't block the event loop, that the concurrency cap
+holds, that 429/5xx responses are retried, and that deadlines are enforced.
+No network access needed.
+
+    python benchmarks/bench_llm_client.py [--json]
+"""
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import httpx
+import uvicorn
+
+import mock_llm_server
+from llm_client import LLMClient, LLMError, LLMTimeout
+
+MESSAGES = [{"role": "user", "content": "Create Amazon A+ content for a water bottle."}]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock_server(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(mock_llm_server.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def configure(base: str, **config):
+    async with httpx.AsyncClient() as client:
+        return (await client.post(f"{base}/_mock/config", json=config)).json()
+
+
+async def loop_lag_during(coro) -> float:
+    """Run coro while measuring the worst event-loop scheduling delay"""
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        while not done:
+            expected = time.monotonic() + 0.01
+            await asyncio.sleep(0.01)
+            worst = max(worst, time.monotonic() - expected)
+
+    task = asyncio.create_task(ticker())
+    try:
+        return_value = await coro
+    finally:
+        done = True
+        await task
+    return return_value, worst
+
+
+async def run(base: str) -> dict:
+    results = {}
+
+    client = LLMClient(base_url=f"{base}/v1", api_key="mock", max_concurrency=4, backoff_base=0.05)
+    await configure(base, reset=True, latency=0.2)
+    started = time.monotonic()
+    calls = asyncio.gather(*[client.chat("mock", MESSAGES) for _ in range(16)])
+    _, lag = await loop_lag_during(calls)
+    state = await configure(base)
+    results["concurrency"] = {
+        "requests": 16,
+        "cap": 4,
+        "max_in_flight": state["max_in_flight"],
+        "elapsed_s": round(time.monotonic() - started, 3),
+        "max_loop_lag_ms": round(lag * 1000, 2),
+        "ok": state["max_in_flight"] <= 4 and lag < 0.1,
+    }
+
+    await configure(base, reset=True, latency=0.0, errors=[429, 503])
+    result = await client.chat("mock", MESSAGES)
+    results["retries"] = {"attempts": result.attempts, "ok": result.attempts == 3 and result.text.startswith("TITLE:")}
+
+    await configure(base, reset=True, errors=[400])
+    try:
+        await client.chat("mock", MESSAGES)
+        results["non_retryable"] = {"ok": False}
+    except LLMError as e:
+        state = await configure(base)
+        results["non_retryable"] = {"status": e.status_code, "calls": state["calls"], "ok": state["calls"] == 1}
+
+    await configure(base, reset=True, latency=2.0)
+    started = time.monotonic()
+    try:
+        await client.chat("mock", MESSAGES, timeout=0.5)
+        results["deadline"] = {"ok": False}
+    except LLMTimeout:
+        elapsed = time.monotonic() - started
+        results["deadline"] = {"timeout_s": 0.5, "elapsed_s": round(elapsed, 3), "ok": elapsed < 0.8}
+
+    await configure(base, reset=True, latency=0.0)
+    await client.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = start_mock_server(port)
+    try:
+        results = asyncio.run(run(f"http://127.0.0.1:{port}"))
+    finally:
+        server.should_exit = True
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, result in results.items():
+            status = "PASS" if result["ok"] else "FAIL"
+            details = ", ".join(f"{k}={v}" for k, v in result.items() if k != "ok")
+            print(f"{status}  {name:<14} {details}")
+    sys.exit(0 if all(r["ok"] for r in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Bytes fetched from the database per request for the project read paths.
+
+Compares the old behaviour (every column, including the generated copy) with
+the deferred "content" group for the ownership check used by the image
+endpoints and for the dashboard listing.
+
+    python benchmarks/bench_project_row_bytes.py [--projects 50] [--json]
+
+Uses DATABASE_URL when set, otherwise a throwaway SQLite file.
+"""
+import argparse
+import json
+import uuid
+
+from _common import seed_projects, use_backend
+
+use_backend()
+
+from sqlalchemy import event
+from sqlalchemy.orm import undefer_group
+
+from server import ProjectDB, SessionLocal, engine
+
+TITLE = "Premium Stainless Steel Insulated Water Bottle, 32oz, Leak-Proof Lid, " * 2
+DESCRIPTION = ("Keep drinks ice-cold for 24 hours or piping hot for 12 with double-wall "
+               "vacuum insulation. Built from food-grade 18/8 stainless steel. " * 30)
+
+
+def value_size(value):
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return len(str(value).encode("utf-8"))
+
+
+def measure(run_query):
+    """Run the ORM query, then replay the SQL it emitted and count result bytes."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    db = SessionLocal()
+    try:
+        run_query(db)
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", capture)
+
+    total = 0
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            for row in conn.exec_driver_sql(statement, parameters):
+                total += sum(value_size(v) for v in row)
+    return {"queries": len(statements), "bytes": total}
+
+
+def ownership_check(project_id, user_id, full_row):
+    def run(db):
+        query = db.query(ProjectDB)
+        if full_row:
+            query = query.options(undefer_group("content"))
+        query.filter(ProjectDB.id == project_id, ProjectDB.user_id == user_id).first()
+    return run
+
+
+def listing(user_id, full_row):
+    def run(db):
+        query = db.query(ProjectDB).filter(ProjectDB.user_id == user_id)
+        if full_row:
+            query = query.options(undefer_group("content"))
+        query.order_by(ProjectDB.created_at.desc()).all()
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=50, help="projects seeded for the listing")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    user_id = str(uuid.uuid4())
+    project_ids = seed_projects(user_id, args.projects, TITLE, DESCRIPTION)
+
+    results = {
+        "projects": args.projects,
+        "database": engine.url.get_backend_name(),
+        "ownership_check": {
+            "before": measure(ownership_check(project_ids[0], user_id, full_row=True)),
+            "after": measure(ownership_check(project_ids[0], user_id, full_row=False)),
+        },
+        "listing": {
+            "before": measure(listing(user_id, full_row=True)),
+            "after": measure(listing(user_id, full_row=False)),
+        },
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\nBytes fetched per request ({results['database']}, {args.projects} projects)")
+    print("-" * 56)
+    for name in ("ownership_check", "listing"):
+        before = results[name]["before"]["bytes"]
+        after = results[name]["after"]["bytes"]
+        saved = 100 * (before - after) / before if before else 0
+        print(f"{name:<18} before {before:>9,}  after {after:>9,}  (-{saved:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
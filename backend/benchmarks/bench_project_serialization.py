@@ -0,0 +1,115 @@
+"""Time to build the GET /api/projects response body for large project lists.
+
+Compares the old path (load ORM entities, construct Project models by hand,
+let FastAPI validate and serialize them again through response_model, render
+with the stdlib json encoder) with server.project_to_dict over column rows
+rendered by FastJSONResponse. Both include the database fetch.
+
+    python benchmarks/bench_project_serialization.py [--sizes 1000,10000] [--repeat 5] [--include-content] [--json]
+
+Uses DATABASE_URL when set, otherwise a throwaway SQLite file.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from typing import List
+
+from _common import seed_projects, use_backend
+
+use_backend()
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy.orm import undefer_group
+
+import server
+from server import PROJECT_LIST_COLUMNS, FastJSONResponse, Project, ProjectDB, SessionLocal, path_to_url, project_to_dict
+
+TITLE = "Premium Stainless Steel Insulated Water Bottle, 32oz, Leak-Proof Lid"
+DESCRIPTION = "Keep drinks ice-cold for 24 hours or piping hot for 12 with double-wall vacuum insulation. " * 8
+
+RESPONSE_FIELD = create_response_field(name="Response_Get_Projects", type_=List[Project])
+
+
+def before(user_id: str, include_content: bool) -> bytes:
+    db = SessionLocal()
+    try:
+        query = db.query(ProjectDB).filter(ProjectDB.user_id == user_id)
+        if include_content:
+            query = query.options(undefer_group("content"))
+        projects = query.order_by(ProjectDB.created_at.desc()).all()
+        models = [
+            Project(
+                id=p.id,
+                user_id=p.user_id,
+                name=p.name,
+                original_image_url=path_to_url(p.original_image_path),
+                processed_image_url=path_to_url(p.processed_image_path),
+                ai_title=p.ai_title if include_content else None,
+                ai_description=p.ai_description if include_content else None,
+                created_at=p.created_at,
+                updated_at=p.updated_at,
+            )
+            for p in projects
+        ]
+        content = asyncio.run(serialize_response(field=RESPONSE_FIELD, response_content=models))
+        return JSONResponse(content).body
+    finally:
+        db.close()
+
+
+def after(user_id: str, include_content: bool) -> bytes:
+    db = SessionLocal()
+    try:
+        columns = PROJECT_LIST_COLUMNS + ((ProjectDB.ai_title, ProjectDB.ai_description) if include_content else ())
+        rows = db.query(*columns).filter(ProjectDB.user_id == user_id).order_by(ProjectDB.created_at.desc()).all()
+        return FastJSONResponse([project_to_dict(r, include_content) for r in rows]).body
+    finally:
+        db.close()
+
+
+def measure(fn, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        timings.append(time.perf_counter() - started)
+    return {"median_ms": round(statistics.median(timings) * 1000, 1), "min_ms": round(min(timings) * 1000, 1), "bytes": len(body)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated project counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--include-content", action="store_true", help="list with ai_title/ai_description")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = {"database": server.engine.url.get_backend_name(), "encoder": FastJSONResponse.__name__, "sizes": {}}
+    for size in (int(s) for s in args.sizes.split(",")):
+        user_id = str(uuid.uuid4())
+        seed_projects(user_id, size, TITLE, DESCRIPTION)
+        old_body, new_body = before(user_id, args.include_content), after(user_id, args.include_content)
+        assert json.loads(old_body) == json.loads(new_body), "response bodies differ"
+        results["sizes"][size] = {
+            "before": measure(lambda: before(user_id, args.include_content), args.repeat),
+            "after": measure(lambda: after(user_id, args.include_content), args.repeat),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\nGET /api/projects response build ({results['database']}, {results['encoder']}, median of {args.repeat})")
+    print("-" * 64)
+    for size, r in results["sizes"].items():
+        speedup = r["before"]["median_ms"] / r["after"]["median_ms"] if r["after"]["median_ms"] else float("inf")
+        print(f"{size:>6} projects  before {r['before']['median_ms']:>8} ms  after {r['after']['median_ms']:>8} ms  ({speedup:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
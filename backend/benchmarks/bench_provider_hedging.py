@@ -0,0 +1,95 @@
+"""Compare tail latency of providers.ProviderPool with and without hedging.
+
+Two stub text providers answer in ~50ms but take ~1s one time in ten. With
+hedging, a call that outlives the primary's p95 gets a second request on the
+other provider, so the p99 should collapse to roughly p95 + the fast path.
+Also checks that a failing primary falls back and that an unhealthy provider
+is ranked last. No network access needed.
+
+    python benchmarks/bench_provider_hedging.py [--requests 300] [--json]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _common import latency_summary
+from providers import ProviderPool
+from stub_providers import StubTextProvider
+
+MESSAGES = [{"role": "user", "content": "Create Amazon A+ content for a water bottle."}]
+
+
+async def measure(pool: ProviderPool, requests: int, concurrency: int = 10) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.monotonic()
+            await pool.call(lambda provider: provider.complete(MESSAGES))
+            latencies.append(time.monotonic() - started)
+
+    await asyncio.gather(*[one() for _ in range(requests)])
+    return latencies
+
+
+def stub_pair() -> list:
+    return [StubTextProvider("primary", seed=1), StubTextProvider("secondary", seed=2)]
+
+
+async def run(requests: int) -> dict:
+    results = {}
+
+    summaries = {}
+    for hedging in (False, True):
+        pool = ProviderPool(stub_pair(), hedging=hedging, hedge_default_delay=0.2)
+        latencies = await measure(pool, requests)
+        summaries[hedging] = {
+            **latency_summary(latencies),
+            "hedges": pool.hedges,
+            "hedge_wins": pool.hedge_wins,
+            "extra_calls_pct": round(100 * (sum(p.calls for p in pool.providers) - requests) / requests, 1),
+        }
+    results["no_hedging"] = {**summaries[False], "ok": True}
+    results["hedging"] = {**summaries[True], "ok": summaries[True]["p99_ms"] < summaries[False]["p99_ms"] / 2}
+
+    failing = StubTextProvider("failing", failure_rate=1.0)
+    backup = StubTextProvider("backup")
+    pool = ProviderPool([failing, backup], hedging=False)
+    result, provider = await pool.call(lambda p: p.complete(MESSAGES))
+    results["fallback"] = {"answered_by": provider.name, "fallbacks": pool.fallbacks, "ok": provider is backup}
+
+    for _ in range(2):
+        await pool.call(lambda p: p.complete(MESSAGES))
+    ranked = [p.name for p in pool.ranked()]
+    results["health"] = {"ranked": ranked, "ok": ranked[0] == "backup" and not failing.tracker.healthy}
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.requests))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, result in results.items():
+            status = "PASS" if result["ok"] else "FAIL"
+            details = ", ".join(f"{k}={v}" for k, v in result.items() if k != "ok")
+            print(f"{status}  {name:<12} {details}")
+    sys.exit(0 if all(r["ok"] for r in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
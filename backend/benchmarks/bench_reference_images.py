@@ -0,0 +1,78 @@
+"""Payload size, latency and peak memory of reference images sent to image models.
+
+Compares the old path (read the whole processed PNG and base64 it) with
+reference_images.ReferenceImageCache, cold and warm, on a synthetic cut-out
+product shot the size enhance_image produces. Peak memory is the Python heap
+as seen by tracemalloc; Pillow's decode buffers are allocated outside it.
+
+    python benchmarks/bench_reference_images.py [--width 4000] [--height 4000] [--json]
+"""
+import argparse
+import base64
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from reference_images import ReferenceImageCache
+
+
+def make_cutout(path: Path, width: int, height: int):
+    """Noisy product on a transparent background, which compresses about as badly as a photo"""
+    rng = random.Random(0)
+    noise = Image.frombytes("RGB", (width // 4, height // 4), rng.randbytes(width // 4 * height // 4 * 3))
+    product = noise.resize((width, height), Image.Resampling.BILINEAR).filter(ImageFilter.GaussianBlur(2))
+    mask = Image.new("L", (width, height), 0)
+    ImageDraw.Draw(mask).ellipse((width // 6, height // 8, width * 5 // 6, height * 7 // 8), fill=255)
+    product.putalpha(mask)
+    product.save(path, "PNG")
+
+
+def measure(fn) -> dict:
+    tracemalloc.start()
+    started = time.perf_counter()
+    payload = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"payload_kb": len(payload) // 1024, "ms": round(elapsed * 1000, 1), "peak_mb": round(peak / 1024 / 1024, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=4000)
+    parser.add_argument("--max-side", type=int, default=1024)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    path = Path(tempfile.mkdtemp()) / "enhanced.png"
+    make_cutout(path, args.width, args.height)
+    cache = ReferenceImageCache(max_side=args.max_side)
+
+    results = {
+        "source_kb": path.stat().st_size // 1024,
+        "full_png_base64": measure(lambda: base64.b64encode(path.read_bytes()).decode("ascii")),
+        "prepared_cold": measure(lambda: cache.get(path).base64),
+        "prepared_warm": measure(lambda: cache.get(path).base64),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"source: {args.width}x{args.height} PNG, {results['source_kb']} KB")
+        for name in ("full_png_base64", "prepared_cold", "prepared_warm"):
+            r = results[name]
+            print(f"{name:<16} payload={r['payload_kb']:>7} KB  time={r['ms']:>8} ms  peak={r['peak_mb']:>6} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Check that importing the server stays within a cold-start budget.
+
+Imports server in a fresh interpreter (in-memory SQLite, no AI keys) and
+fails if it takes longer than the budget or if any module that should only
+load on first use (provider SDKs, httpx, Pillow, redis) was imported. Prints
+the slowest imports to show where the time went.
+
+    python benchmarks/check_import_time.py [--budget 1.5] [--runs 3] [--json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+LAZY_MODULES = ["google.generativeai", "emergentintegrations", "openai", "httpx", "PIL", "redis"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import server
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def probe_env() -> dict:
+    env = {k: v for k, v in os.environ.items() if not k.endswith(("_API_KEY", "_LLM_KEY")) and k != "REDIS_URL"}
+    env["DATABASE_URL"] = "sqlite://"
+    return env
+
+
+def run_probe() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=probe_env(), capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def slowest_imports(limit: int) -> list:
+    """Top-level imports made by server, by cumulative microseconds, from -X importtime"""
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"], cwd=BACKEND_DIR, env=probe_env(), capture_output=True, text=True
+    ).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Direct children of the server import are indented by exactly three spaces
+        if name.startswith("   ") and not name.startswith("    ") and cumulative.strip().isdigit():
+            rows.append((int(cumulative), name.strip()))
+    return [{"module": name, "ms": round(us / 1000, 1)} for us, name in sorted(rows, reverse=True)[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=float(os.environ.get("IMPORT_TIME_BUDGET_SECONDS", "1.5")))
+    parser.add_argument("--runs", type=int, default=3, help="take the best of this many cold imports")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    probes = [run_probe() for _ in range(args.runs)]
+    best = min(p["seconds"] for p in probes)
+    loaded = set(probes[0]["modules"])
+    eager = [m for m in LAZY_MODULES if m in loaded]
+    results = {
+        "seconds": round(best, 3),
+        "budget": args.budget,
+        "eager_lazy_modules": eager,
+        "slowest": slowest_imports(10),
+        "ok": best <= args.budget and not eager,
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        status = "PASS" if results["ok"] else "FAIL"
+        print(f"{status}  import server: {results['seconds']}s (budget {args.budget}s)")
+        if eager:
+            print(f"      loaded at import but should be lazy: {', '.join(eager)}")
+        for row in results["slowest"]:
+            print(f"      {row['ms']:>8} ms  {row['module']}")
+    sys.exit(0 if results["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
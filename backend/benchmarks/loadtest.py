@@ -0,0 +1,345 @@
+"""Load test the whole API locally with concurrent, realistic scenarios.
+
+Boots `uvicorn server:app` against a throwaway SQLite database (or
+DATABASE_URL) with benchmarks/mock_llm_server.py standing in for OpenAI, then
+runs each scenario for --duration seconds with --concurrency virtual users:
+
+- auth: signup followed by login (bound by password hashing)
+- dashboard: list the projects of a seeded account, revalidating with
+  If-None-Match the way the browser does, and fetch one project
+- image_flow: create a project, upload a JPEG, remove the background,
+  enhance, fetch and delete it
+- content: generate A+ copy through the mock provider (always a cache miss)
+
+Reports requests per second, p50/p95/p99 latency and error rate per scenario
+and per step. --output writes the results as JSON; --compare prints the
+change against an earlier JSON run, so runs can be diffed between commits.
+
+    python benchmarks/loadtest.py [--scenarios auth,dashboard,image_flow,content]
+                                  [--concurrency 16] [--duration 15] [--workers 1]
+                                  [--output run.json] [--compare baseline.json]
+    python benchmarks/loadtest.py --url http://127.0.0.1:8000   # test a running server
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from _common import latency_summary, make_image
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+SCENARIOS = ("auth", "dashboard", "image_flow", "content")
+PASSWORD = "loadtest-password"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: Dict[str, List[tuple]] = defaultdict(list)
+
+    async def request(self, client: httpx.AsyncClient, scenario: str, step: str, method: str, url: str,
+                      expect=(200,), **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            ok = response.status_code in expect
+        except httpx.HTTPError:
+            response, ok = None, False
+        self.samples[f"{scenario}/{step}"].append((time.perf_counter() - started, ok))
+        return response if ok else None
+
+    def summary(self, scenario: str, elapsed: float) -> dict:
+        steps = {}
+        everything = []
+        for key, samples in self.samples.items():
+            name, _, step = key.partition("/")
+            if name == scenario:
+                steps[step] = summarize(samples, elapsed)
+                everything.extend(samples)
+        return {**summarize(everything, elapsed), "steps": steps}
+
+
+def summarize(samples: List[tuple], elapsed: float) -> dict:
+    errors = sum(1 for s in samples if not s[1])
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        **latency_summary(s[0] for s in samples),
+    }
+
+
+async def signup(client: httpx.AsyncClient, api: str) -> dict:
+    response = await client.post(f"{api}/auth/signup", json={"email": f"load-{uuid.uuid4().hex[:12]}@example.com", "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def auth_user(client, api, recorder, state):
+    email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+    credentials = {"email": email, "password": PASSWORD}
+    if await recorder.request(client, "auth", "signup", "POST", f"{api}/auth/signup", json=credentials):
+        await recorder.request(client, "auth", "login", "POST", f"{api}/auth/login", json=credentials)
+
+
+async def dashboard_user(client, api, recorder, state):
+    # Each virtual user keeps its own validator, like a browser cache
+    etag = state.setdefault("etag", {}).get(id(asyncio.current_task()))
+    headers = {**state["dashboard_headers"], **({"If-None-Match": etag} if etag else {})}
+    response = await recorder.request(client, "dashboard", "list", "GET", f"{api}/projects", expect=(200, 304), headers=headers)
+    if response is not None and "etag" in response.headers:
+        state["etag"][id(asyncio.current_task())] = response.headers["etag"]
+    project_id = random.choice(state["dashboard_projects"])
+    await recorder.request(client, "dashboard", "get", "GET", f"{api}/projects/{project_id}", headers=state["dashboard_headers"])
+
+
+async def image_flow_user(client, api, recorder, state):
+    headers = state["image_headers"]
+    response = await recorder.request(client, "image_flow", "create", "POST", f"{api}/projects", json={"name": "Load test"}, headers=headers)
+    if response is None:
+        return
+    project_id = response.json()["id"]
+    try:
+        files = {"file": ("product.jpg", state["photo"], "image/jpeg")}
+        if not await recorder.request(client, "image_flow", "upload", "POST", f"{api}/image/upload/{project_id}", files=files, headers=headers):
+            return
+        if not await recorder.request(client, "image_flow", "remove_background", "POST", f"{api}/image/remove-background/{project_id}", headers=headers):
+            return
+        if not await recorder.request(client, "image_flow", "enhance", "POST", f"{api}/image/enhance/{project_id}", headers=headers):
+            return
+        await recorder.request(client, "image_flow", "get", "GET", f"{api}/projects/{project_id}", headers=headers)
+    finally:
+        # Deleting also removes the uploaded and processed files
+        await recorder.request(client, "image_flow", "delete", "DELETE", f"{api}/projects/{project_id}", headers=headers)
+
+
+async def content_user(client, api, recorder, state):
+    payload = {"product_type": f"water bottle {uuid.uuid4().hex[:8]}", "key_features": "insulated, 32oz, leak-proof"}
+    await recorder.request(client, "content", "generate", "POST", f"{api}/content/generate", json=payload, headers=state["content_headers"])
+
+
+USERS = {"auth": auth_user, "dashboard": dashboard_user, "image_flow": image_flow_user, "content": content_user}
+
+
+async def prepare(client: httpx.AsyncClient, api: str, scenarios, dashboard_projects: int) -> dict:
+    state = {}
+    if "dashboard" in scenarios:
+        state["dashboard_headers"] = await signup(client, api)
+        state["dashboard_projects"] = []
+        for i in range(dashboard_projects):
+            response = await client.post(f"{api}/projects", json={"name": f"Seeded project {i}"}, headers=state["dashboard_headers"])
+            response.raise_for_status()
+            state["dashboard_projects"].append(response.json()["id"])
+    if "image_flow" in scenarios:
+        state["image_headers"] = await signup(client, api)
+        state["photo"] = make_image()
+    if "content" in scenarios:
+        state["content_headers"] = await signup(client, api)
+    return state
+
+
+async def run_scenario(client, api, scenario, state, concurrency: int, duration: float) -> dict:
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+    user = USERS[scenario]
+
+    async def virtual_user():
+        while time.perf_counter() < deadline:
+            await user(client, api, recorder, state)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+    return recorder.summary(scenario, time.perf_counter() - started)
+
+
+async def run(base_url: str, args) -> dict:
+    api = f"{base_url}/api"
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        state = await prepare(client, api, args.scenarios, args.dashboard_projects)
+        results = {}
+        for scenario in args.scenarios:
+            results[scenario] = await run_scenario(client, api, scenario, state, args.concurrency, args.duration)
+        return results
+
+
+def wait_until_up(url: str, process: Optional[subprocess.Popen], timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"{url} exited with status {process.returncode} during startup")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def start_local(args) -> (str, list):
+    """Start the mock LLM and the API; returns the API base URL and the processes to stop"""
+    mock_port, api_port = free_port(), free_port()
+    workdir = Path(tempfile.mkdtemp(prefix="loadtest-"))
+    # Server logs go to a file so they don't interleave with the report
+    log = open(workdir / "server.log", "wb")
+    mock = subprocess.Popen(
+        [sys.executable, str(BACKEND_DIR / "benchmarks" / "mock_llm_server.py"), "--port", str(mock_port), "--latency", str(args.llm_latency)],
+        cwd=BACKEND_DIR,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    env = {
+        **os.environ,
+        "DATABASE_URL": os.environ.get("DATABASE_URL") or f"sqlite:///{workdir}/loadtest.db",
+        # Keep the image scenario's files out of backend/uploads
+        "UPLOAD_DIR": str(workdir / "uploads"),
+        "OPENAI_API_KEY": "mock",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{mock_port}/v1",
+        "TEXT_PROVIDERS": "openai",
+        "IMAGE_PROVIDERS": "",
+        "DISABLE_AI": "false",
+        "BASE_URL": f"http://127.0.0.1:{api_port}",
+    }
+    if args.bcrypt_rounds:
+        env["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--host", "127.0.0.1", "--port", str(api_port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    processes = [api, mock]
+    try:
+        wait_until_up(f"http://127.0.0.1:{mock_port}/_mock/state", mock)
+        wait_until_up(f"http://127.0.0.1:{api_port}/api/", api)
+    except Exception:
+        stop(processes)
+        print(f"server log: {workdir / 'server.log'}", file=sys.stderr)
+        raise
+    return f"http://127.0.0.1:{api_port}", processes
+
+
+def stop(processes: list):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results: dict):
+    print(f"\n{'scenario/step':<30} {'req':>7} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8}")
+    print("-" * 86)
+    for scenario, summary in results.items():
+        rows = [(scenario, summary)] + [(f"  {step}", s) for step, s in summary["steps"].items()]
+        for name, s in rows:
+            print(f"{name:<30} {s['requests']:>7} {s['rps']:>8} {s['p50_ms']:>9} {s['p95_ms']:>9} {s['p99_ms']:>9} {s['error_rate']:>8.2%}")
+
+
+def print_comparison(results: dict, baseline: dict):
+    print(f"\nChange against {baseline.get('commit') or 'baseline'} (negative latency is better)")
+    print(f"{'scenario':<30} {'rps':>10} {'p50':>10} {'p95':>10} {'p99':>10} {'errors':>10}")
+    print("-" * 84)
+
+    def change(new, old):
+        return f"{100 * (new - old) / old:+.1f}%" if old else "n/a"
+
+    for scenario, summary in results.items():
+        old = baseline["scenarios"].get(scenario)
+        if old is None:
+            continue
+        print(f"{scenario:<30} {change(summary['rps'], old['rps']):>10} {change(summary['p50_ms'], old['p50_ms']):>10} "
+              f"{change(summary['p95_ms'], old['p95_ms']):>10} {change(summary['p99_ms'], old['p99_ms']):>10} "
+              f"{summary['error_rate'] - old['error_rate']:>+10.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated, from: " + ", ".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16, help="virtual users per scenario")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per scenario")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout in seconds")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the local server")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="mock LLM reply latency in seconds")
+    parser.add_argument("--bcrypt-rounds", type=int, default=None, help="override BCRYPT_ROUNDS on the local server")
+    parser.add_argument("--dashboard-projects", type=int, default=50, help="projects seeded for the dashboard scenario")
+    parser.add_argument("--url", help="test an already running server instead of starting one")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    processes = []
+    base_url = args.url.rstrip("/") if args.url else None
+    if base_url is None:
+        base_url, processes = start_local(args)
+    try:
+        scenarios = asyncio.run(run(base_url, args))
+    finally:
+        stop(processes)
+
+    results = {
+        "commit": git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "target": args.url or "local",
+        "config": {
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "workers": args.workers,
+            "llm_latency": args.llm_latency,
+            "bcrypt_rounds": args.bcrypt_rounds,
+            "dashboard_projects": args.dashboard_projects,
+            "database": "DATABASE_URL" if os.environ.get("DATABASE_URL") else "sqlite",
+        },
+        "scenarios": scenarios,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(scenarios)
+    if args.compare:
+        print_comparison(scenarios, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
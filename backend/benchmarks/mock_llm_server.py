@@ -0,0 +1,138 @@
+"""Local stand-in for an OpenAI-compatible chat completions API.
+
+    python benchmarks/mock_llm_server.py --port 9100 --latency 0.5
+    OPENAI_BASE_URL=http://127.0.0.1:9100/v1 OPENAI_API_KEY=mock uvicorn server:app
+
+Replies in the TITLE:/DESCRIPTION: format the content endpoints expect, with
+configurable latency; "stream": true requests get SSE chunks, one word every
+token_delay seconds after the initial latency. POST /_mock/config sets the
+timings or queues error status codes returned by the next requests;
+GET /_mock/state reports call counts and the peak number of concurrent
+requests seen.
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+from typing import List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+app = FastAPI()
+
+
+class MockState:
+    def __init__(self, latency: float = 0.0, token_delay: float = 0.02):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.errors: List[int] = []
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+state = MockState()
+
+
+class MockConfig(BaseModel):
+    latency: Optional[float] = None
+    token_delay: Optional[float] = None
+    errors: Optional[List[int]] = None
+    reset: bool = False
+
+
+def completion_text(messages: list) -> str:
+    prompt = messages[-1]["content"] if messages else ""
+    subject = prompt.split("\n", 1)[0].replace("Create Amazon A+ content for a", "").strip(" .") or "product"
+    return (
+        f"TITLE: Premium {subject} - Durable, Reliable and Built to Last\n"
+        f"DESCRIPTION: Meet the {subject} designed for everyday use. "
+        "Every detail has been considered, from materials to finish.\n\n"
+        "Backed by quality craftsmanship, it delivers consistent performance "
+        "and makes a thoughtful gift."
+    )
+
+
+async def stream_completion(model: str, text: str):
+    for token in re.findall(r"\S+\s*|\s+", text):
+        await asyncio.sleep(state.token_delay)
+        chunk = {"object": "chat.completion.chunk", "model": model, "choices": [{"index": 0, "delta": {"content": token}}]}
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    state.calls += 1
+    state.in_flight += 1
+    state.max_in_flight = max(state.max_in_flight, state.in_flight)
+    try:
+        await asyncio.sleep(state.latency)
+        if state.errors:
+            status = state.errors.pop(0)
+            return JSONResponse({"error": {"message": "mock error"}}, status_code=status, headers={"Retry-After": "0"})
+
+        messages = body.get("messages", [])
+        text = completion_text(messages)
+        if body.get("stream"):
+            return StreamingResponse(stream_completion(body.get("model", "mock"), text), media_type="text/event-stream")
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+        return {
+            "id": f"mock-{state.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(text) // 4,
+                "total_tokens": prompt_tokens + len(text) // 4,
+            },
+        }
+    finally:
+        state.in_flight -= 1
+
+
+@app.post("/_mock/config")
+async def configure(config: MockConfig):
+    if config.reset:
+        state.__init__(state.latency, state.token_delay)
+    if config.latency is not None:
+        state.latency = config.latency
+    if config.token_delay is not None:
+        state.token_delay = config.token_delay
+    if config.errors is not None:
+        state.errors = list(config.errors)
+    return await get_state()
+
+
+@app.get("/_mock/state")
+async def get_state():
+    return {
+        "latency": state.latency,
+        "token_delay": state.token_delay,
+        "pending_errors": state.errors,
+        "calls": state.calls,
+        "in_flight": state.in_flight,
+        "max_in_flight": state.max_in_flight,
+    }
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before each reply")
+    args = parser.parse_args()
+    state.latency = args.latency
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""In-process stub providers for exercising providers.ProviderPool.
+
+Each stub answers after a latency drawn from a configurable distribution:
+mostly fast, with a slow tail and an optional failure rate, which is the
+shape that makes hedging worthwhile.
+"""
+import asyncio
+import random
+import sys
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from llm_client import ChatResult
+from providers import ImageProvider, ProviderError, TextProvider
+from reference_images import ReferenceImage
+
+COMPLETION = "TITLE: Stub Product\nDESCRIPTION: A stub description for benchmarking."
+
+
+class StubTextProvider(TextProvider):
+    def __init__(self, name: str, latency: float = 0.05, tail_latency: float = 1.0, tail_rate: float = 0.1,
+                 failure_rate: float = 0.0, seed: int = 0):
+        super().__init__()
+        self.name = name
+        self.model = f"stub-{name}"
+        self.latency = latency
+        self.tail_latency = tail_latency
+        self.tail_rate = tail_rate
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.cancelled = 0
+
+    def _delay(self) -> float:
+        base = self.tail_latency if self.random.random() < self.tail_rate else self.latency
+        return base * self.random.uniform(0.8, 1.2)
+
+    async def complete(self, messages: List[dict]) -> ChatResult:
+        self.calls += 1
+        delay = self._delay()
+        fail = self.random.random() < self.failure_rate
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if fail:
+            raise ProviderError(f"{self.name} stub failure")
+        return ChatResult(text=COMPLETION, model=self.model, latency=delay)
+
+    async def stream(self, messages: List[dict]):
+        result = await self.complete(messages)
+        for word in result.text.split(" "):
+            yield word + " "
+
+
+class StubImageProvider(ImageProvider):
+    def __init__(self, name: str, latency: float = 0.05, png: bytes = b""):
+        super().__init__()
+        self.name = name
+        self.model = f"stub-{name}"
+        self.latency = latency
+        self.png = png
+
+    async def generate(self, prompt: str, reference: ReferenceImage) -> bytes:
+        await asyncio.sleep(self.latency)
+        return self.png or reference.data
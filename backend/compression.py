@@ -0,0 +1,105 @@
+"""Response compression for API bodies.
+
+Complete responses (a single body message) with a text-like content type and
+at least `minimum_size` bytes are compressed with brotli when the client
+accepts it and the optional `brotli` package is installed, gzip otherwise.
+Streaming responses (SSE, file downloads) pass through untouched so events
+are never held back waiting for a compressor, and images are left alone
+because they are already compressed.
+"""
+import asyncio
+import gzip
+
+from starlette.datastructures import MutableHeaders
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+# Bodies above this are compressed off the event loop
+_THREAD_THRESHOLD = 256 * 1024
+
+
+def accepted_encodings(header: str) -> set:
+    """Codings from an Accept-Encoding header, minus those sent with q=0"""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0 and coding.strip():
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+        self.brotli = brotli
+
+    def _choose(self, scope):
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accepted = accepted_encodings(value.decode("latin-1"))
+                if self.brotli is not None and "br" in accepted:
+                    return "br"
+                if "gzip" in accepted or "*" in accepted:
+                    return "gzip"
+                return None
+        return None
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return self.brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self._choose(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+
+        async def send_wrapper(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is None:
+                await send(message)
+                return
+
+            held, start = start, None
+            headers = MutableHeaders(raw=list(held.get("headers", [])))
+            compressible = headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES) and "content-encoding" not in headers
+            if compressible:
+                headers.add_vary_header("Accept-Encoding")
+            body = message.get("body", b"")
+            if not compressible or message.get("more_body", False) or len(body) < self.minimum_size:
+                await send({**held, "headers": headers.raw})
+                await send(message)
+                return
+
+            if len(body) > _THREAD_THRESHOLD:
+                compressed = await asyncio.to_thread(self._compress, body, encoding)
+            else:
+                compressed = self._compress(body, encoding)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            await send({**held, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,55 @@
+"""Fingerprinting and hit-rate accounting for the content generation cache.
+
+Requests that differ only in case, spacing, punctuation between features or
+feature order describe the same product, so they share a fingerprint. The
+model and prompt version are part of the key: changing either naturally
+invalidates every cached entry without a purge.
+"""
+import hashlib
+import json
+import re
+from typing import Optional
+
+_WHITESPACE = re.compile(r"\s+")
+_FEATURE_SPLIT = re.compile(r"[,;\n]+")
+
+
+def normalize_text(value: Optional[str]) -> str:
+    return _WHITESPACE.sub(" ", (value or "").strip().lower())
+
+
+def normalize_features(value: Optional[str]) -> list:
+    features = {normalize_text(f).strip(" .-*•") for f in _FEATURE_SPLIT.split(value or "")}
+    return sorted(f for f in features if f)
+
+
+def fingerprint(product_type: str, key_features: Optional[str], model: str, prompt_version: str) -> str:
+    key = json.dumps({
+        "product_type": normalize_text(product_type),
+        "key_features": normalize_features(key_features),
+        "model": model,
+        "prompt_version": prompt_version,
+    }, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class CacheStats:
+    """Per-process counters, reported by GET /api/content/cache/stats"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def snapshot(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,67 @@
+"""Incremental parsing of streamed TITLE:/DESCRIPTION: completions.
+
+The model answers in the format requested by build_content_prompt. While it
+streams, SectionParser splits the text into title and description deltas as
+soon as they can be attributed, holding back only trailing whitespace and a
+possible partial marker at the end of the buffer (e.g. "DESCRIP").
+"""
+from typing import List, Tuple
+
+MARKERS = {"TITLE:": "title", "DESCRIPTION:": "description"}
+_LONGEST_MARKER = max(len(m) for m in MARKERS)
+
+
+class SectionParser:
+    def __init__(self):
+        # Text before any marker counts as title, matching parse_generated_content
+        self.section = "title"
+        self._buffer = ""
+        self._at_section_start = True
+
+    def _emit(self, text: str, events: List[Tuple[str, str]]):
+        if self._at_section_start:
+            text = text.lstrip()
+        if not text:
+            return
+        self._at_section_start = False
+        events.append((self.section, text))
+
+    def _held_back(self) -> int:
+        """Length of the longest buffer suffix that could still become a marker"""
+        if self.section == "description":
+            return 0
+        for size in range(min(len(self._buffer), _LONGEST_MARKER - 1), 0, -1):
+            tail = self._buffer[-size:]
+            if any(marker.startswith(tail) for marker in MARKERS):
+                return size
+        return 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """Return (section, text) deltas that can be attributed so far"""
+        events: List[Tuple[str, str]] = []
+        self._buffer += chunk
+        # Once in the description, marker-like text is just part of the copy
+        while self.section == "title":
+            found = [(self._buffer.find(m), m) for m in MARKERS if m in self._buffer]
+            if not found:
+                break
+            index, marker = min(found)
+            self._emit(self._buffer[:index].rstrip(), events)
+            self.section = MARKERS[marker]
+            self._at_section_start = True
+            self._buffer = self._buffer[index + len(marker):]
+
+        # Trailing whitespace is held too: it is dropped if a marker follows
+        keep = self._held_back()
+        ready = self._buffer[:len(self._buffer) - keep].rstrip()
+        self._buffer = self._buffer[len(ready):]
+        if ready:
+            self._emit(ready, events)
+        return events
+
+    def close(self) -> List[Tuple[str, str]]:
+        events: List[Tuple[str, str]] = []
+        if self._buffer:
+            self._emit(self._buffer.rstrip(), events)
+            self._buffer = ""
+        return events
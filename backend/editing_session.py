@@ -0,0 +1,174 @@
+"""Interactive image editing over a WebSocket, with progressive previews.
+
+Each operation is applied to a small proxy of the image first, and that
+preview is pushed straight away. The same operation is then queued for the
+full-resolution image in a background worker, and the client gets the saved
+render's URL to swap in. Full renders run one at a time and in order. While
+more edits are queued, intermediate results are not saved, so a burst of
+edits costs one save. If the client disconnects, its queued edits are still
+rendered and saved.
+
+Protocol (JSON text frames unless noted):
+  client -> {"type": "auth", "token": "<JWT>"}           first message
+  client -> {"op": "remove_background" | "enhance", "seq": <any, echoed back>}
+  server -> {"type": "ready", "width", "height", "preview_max_side"}
+  server -> {"type": "preview", "seq", "op", "mime", "width", "height"}, then one binary frame with the image
+  server -> {"type": "full", "seq", "processed_image_url"}
+  server -> {"type": "error", "seq", "detail"}
+"""
+import asyncio
+import logging
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+from image_ops import remove_white_background, upscale
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = {
+    "remove_background": remove_white_background,
+    "enhance": lambda img: upscale(img, 2),
+}
+# How much each operation grows the image's width and height
+OUTPUT_SCALE = {"enhance": 2}
+
+
+def load_image(path: Path) -> "Image.Image":
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img.load()
+        return img.copy()
+
+
+def make_proxy(img: "Image.Image", max_side: int) -> "Image.Image":
+    from PIL import Image
+
+    proxy = img.copy()
+    proxy.thumbnail((max_side, max_side), Image.Resampling.BILINEAR)
+    return proxy
+
+
+def encode_preview(img: "Image.Image") -> Tuple[bytes, str]:
+    out = BytesIO()
+    if img.mode in ("RGBA", "LA", "P"):
+        img.save(out, "PNG", compress_level=1)
+        return out.getvalue(), "image/png"
+    img.convert("RGB").save(out, "JPEG", quality=80)
+    return out.getvalue(), "image/jpeg"
+
+
+class EditingSession:
+    def __init__(self, source_path: Path, send_json: Callable, send_bytes: Callable,
+                 persist: Callable[["Image.Image"], str], preview_max_side: int = 512,
+                 observe: Optional[Callable] = None, max_pixels: Optional[int] = None):
+        """persist(image) saves a full-resolution render and returns its URL; it runs in a worker thread.
+
+        Operations whose full-resolution output would exceed max_pixels (default:
+        Pillow's decompression-bomb limit) are refused. The image is never re-opened
+        here, so Pillow's own check never runs.
+        """
+        self.source_path = source_path
+        self._send_json = send_json
+        self._send_bytes = send_bytes
+        self.persist = persist
+        self.preview_max_side = preview_max_side
+        self.observe = observe
+        self.max_pixels = max_pixels
+        # Size of the full image once every queued operation has run
+        self.size: Tuple[int, int] = (0, 0)
+        self.full: Optional["Image.Image"] = None
+        self.proxy: Optional["Image.Image"] = None
+        self.connected = True
+        self._send_lock = asyncio.Lock()
+        self._renders: asyncio.Queue = asyncio.Queue()
+        self.worker: Optional[asyncio.Task] = None
+
+    async def open(self) -> dict:
+        if self.max_pixels is None:
+            from PIL import Image
+
+            self.max_pixels = Image.MAX_IMAGE_PIXELS
+        self.full = await asyncio.to_thread(load_image, self.source_path)
+        self.size = self.full.size
+        self.proxy = await asyncio.to_thread(make_proxy, self.full, self.preview_max_side)
+        self.worker = asyncio.create_task(self._render_full())
+        return {"type": "ready", "width": self.full.width, "height": self.full.height, "preview_max_side": self.preview_max_side}
+
+    async def send(self, message: dict, data: Optional[bytes] = None):
+        """Send a message (and its binary frame) unless the client has gone away"""
+        if not self.connected:
+            return
+        try:
+            async with self._send_lock:
+                await self._send_json(message)
+                if data is not None:
+                    await self._send_bytes(data)
+        except Exception:
+            self.connected = False
+
+    def _preview(self, op: str) -> Tuple["Image.Image", bytes, str]:
+        started = time.perf_counter()
+        proxy = OPERATIONS[op](self.proxy)
+        if max(proxy.size) > self.preview_max_side:
+            proxy = make_proxy(proxy, self.preview_max_side)
+        data, mime = encode_preview(proxy)
+        if self.observe:
+            self.observe(f"{op}_preview", started, proxy.size)
+        return proxy, data, mime
+
+    async def apply(self, op: str, seq: int):
+        if op not in OPERATIONS:
+            await self.send({"type": "error", "seq": seq, "detail": f"Unknown operation: {op}"})
+            return
+        scale = OUTPUT_SCALE.get(op, 1)
+        width, height = self.size[0] * scale, self.size[1] * scale
+        if self.max_pixels and width * height > self.max_pixels:
+            await self.send({"type": "error", "seq": seq, "detail": f"{op} would make the image {width}x{height}, over the {self.max_pixels:,} pixel limit"})
+            return
+        self.size = (width, height)
+        self.proxy, data, mime = await asyncio.to_thread(self._preview, op)
+        await self.send({"type": "preview", "seq": seq, "op": op, "mime": mime, "width": self.proxy.width, "height": self.proxy.height}, data)
+        self._renders.put_nowait((op, seq))
+
+    def close(self):
+        """Stop taking edits; queued full renders still finish and are saved"""
+        self._renders.put_nowait(None)
+
+    async def _render_full(self):
+        dirty = None
+        while True:
+            item = await self._renders.get()
+            if item is None:
+                if dirty is not None:
+                    await self._save(dirty)
+                return
+            op, seq = item
+            started = time.perf_counter()
+            try:
+                self.full = await asyncio.to_thread(OPERATIONS[op], self.full)
+            except Exception as e:
+                logger.error(f"Full-resolution {op} failed: {str(e)}")
+                await self.send({"type": "error", "seq": seq, "detail": f"{op} failed"})
+                continue
+            if self.observe:
+                self.observe(op, started, self.full.size)
+            dirty = seq
+            # Only the newest state is worth saving; more edits are already queued
+            if self._renders.empty():
+                await self._save(dirty)
+                dirty = None
+
+    async def _save(self, seq: int):
+        try:
+            url = await asyncio.to_thread(self.persist, self.full)
+        except Exception as e:
+            logger.error(f"Saving edited image failed: {str(e)}")
+            await self.send({"type": "error", "seq": seq, "detail": "Saving the full-resolution image failed"})
+            return
+        await self.send({"type": "full", "seq": seq, "processed_image_url": url})
@@ -0,0 +1,153 @@
+"""Idempotency-Key support for expensive POST endpoints.
+
+A request with an `Idempotency-Key` header claims (user, method, path, key)
+by inserting an in-progress row. The primary key makes the claim atomic
+across workers. When the handler succeeds, its JSON response is stored on the
+row. Retries with the same key get that response back, marked
+`Idempotent-Replayed: true`, until the row expires.
+
+A retry that arrives while the original is still running waits for it to
+finish. After `wait_seconds` it gets 409 instead. A failed request releases
+its claim, so a retry recomputes. Reusing a key for a different payload gets
+422. A claim left behind by a dead worker expires after `lock_seconds` and
+can be taken over.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from typing import Awaitable, Callable, Optional, Union
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import IntegrityError
+from starlette.requests import Request
+from starlette.responses import Response
+
+MAX_KEY_LENGTH = 255
+_HASH_CHUNK = 1024 * 1024
+
+
+def file_fingerprint(f) -> str:
+    """sha256 of an uploaded file's content; leaves the file at position 0"""
+    digest = hashlib.sha256()
+    f.seek(0)
+    for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+        digest.update(chunk)
+    f.seek(0)
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    def __init__(self, session_factory, model, ttl: float = 24 * 3600, lock_seconds: float = 300.0,
+                 wait_seconds: float = 30.0, poll_interval: float = 0.25):
+        self.session_factory = session_factory
+        self.model = model
+        self.ttl = ttl
+        self.lock_seconds = lock_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_interval = poll_interval
+        self.replayed = 0
+        self.conflicts = 0
+
+    def _claim(self, record_id: str, user_id: str, fingerprint: str) -> Optional[dict]:
+        """None when this request now owns the key, otherwise the existing record"""
+        db = self.session_factory()
+        try:
+            now = time.time()
+            db.add(self.model(id=record_id, user_id=user_id, fingerprint=fingerprint, status="in_progress",
+                              created_at=now, expires_at=now + self.lock_seconds))
+            try:
+                db.commit()
+                return None
+            except IntegrityError:
+                db.rollback()
+
+            # Expired: a completed response past its TTL or a claim whose worker died
+            taken = db.query(self.model).filter(self.model.id == record_id, self.model.expires_at < now).update(
+                {"user_id": user_id, "fingerprint": fingerprint, "status": "in_progress", "status_code": None,
+                 "response": None, "created_at": now, "expires_at": now + self.lock_seconds},
+                synchronize_session=False
+            )
+            db.commit()
+            if taken:
+                return None
+            row = db.get(self.model, record_id)
+            if row is None:
+                # Released between our insert and read; the next poll claims it
+                return {"status": "released", "fingerprint": fingerprint}
+            return {"status": row.status, "fingerprint": row.fingerprint, "status_code": row.status_code, "response": row.response}
+        finally:
+            db.close()
+
+    def _complete(self, record_id: str, status_code: int, body: bytes):
+        db = self.session_factory()
+        try:
+            db.query(self.model).filter(self.model.id == record_id).update(
+                {"status": "completed", "status_code": status_code, "response": body, "expires_at": time.time() + self.ttl},
+                synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _release(self, record_id: str):
+        db = self.session_factory()
+        try:
+            db.query(self.model).filter(self.model.id == record_id, self.model.status == "in_progress").delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def purge(self) -> int:
+        db = self.session_factory()
+        try:
+            deleted = db.query(self.model).filter(self.model.expires_at < time.time()).delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    async def run(self, request: Request, user_id: str, fingerprint: Union[str, Callable[[], str]], compute: Callable[[], Awaitable]):
+        """Run compute() at most once per Idempotency-Key; without the header it simply runs.
+
+        fingerprint identifies the payload; pass a callable when it is costly
+        (hashing an upload) so requests without a key don't pay for it.
+        """
+        key = request.headers.get("idempotency-key")
+        if key is None:
+            return await compute()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+        if callable(fingerprint):
+            fingerprint = fingerprint()
+
+        record_id = hashlib.sha256(f"{user_id}\0{request.method}\0{request.url.path}\0{key}".encode()).hexdigest()
+        deadline = time.monotonic() + self.wait_seconds
+        existing = self._claim(record_id, user_id, fingerprint)
+        while existing is not None:
+            if existing["fingerprint"] != fingerprint:
+                raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+            if existing["status"] == "completed":
+                self.replayed += 1
+                return Response(existing["response"], status_code=existing["status_code"], media_type="application/json",
+                                headers={"Idempotent-Replayed": "true"})
+            if time.monotonic() > deadline:
+                self.conflicts += 1
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress",
+                                    headers={"Retry-After": "1"})
+            await asyncio.sleep(self.poll_interval)
+            existing = self._claim(record_id, user_id, fingerprint)
+
+        try:
+            result = await compute()
+        except BaseException:
+            # Errors (and cancelled requests) are not recorded, so a retry recomputes
+            self._release(record_id)
+            raise
+        body = json.dumps(jsonable_encoder(result)).encode()
+        self._complete(record_id, 200, body)
+        return Response(body, media_type="application/json")
+
+    def stats(self) -> dict:
+        return {"replayed": self.replayed, "conflicts": self.conflicts}
@@ -0,0 +1,70 @@
+"""Pixel operations behind the image endpoints.
+
+Kept free of request and database state so benchmarks/bench_image_ops.py
+measures exactly what the endpoints run.
+"""
+import base64
+from io import BytesIO
+from typing import TYPE_CHECKING, BinaryIO, Optional
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+WHITE_THRESHOLD = 240
+PLACEHOLDER_MAX_SIDE = 16
+
+
+def remove_white_background(img: "Image.Image", threshold: int = WHITE_THRESHOLD) -> "Image.Image":
+    """Make near-white pixels transparent; returns an RGBA copy"""
+    img = img.convert("RGBA")
+    data = []
+    for item in img.getdata():
+        if item[0] > threshold and item[1] > threshold and item[2] > threshold:
+            data.append((255, 255, 255, 0))
+        else:
+            data.append(item)
+    img.putdata(data)
+    return img
+
+
+def upscale(img: "Image.Image", factor: int = 2) -> "Image.Image":
+    from PIL import Image
+
+    width, height = img.size
+    return img.resize((width * factor, height * factor), Image.Resampling.LANCZOS)
+
+
+def encode_image(img: "Image.Image", out: BinaryIO, source_format: Optional[str] = None) -> str:
+    """Write img to out and return its MIME type.
+
+    PNG when the result has transparency; otherwise a JPEG or WebP source keeps
+    its format, so an opaque photo doesn't balloon into a lossless PNG.
+    """
+    has_alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+    if not has_alpha and source_format == "JPEG":
+        img.convert("RGB").save(out, "JPEG", quality=92)
+        return "image/jpeg"
+    if not has_alpha and source_format == "WEBP":
+        img.save(out, "WEBP", quality=92)
+        return "image/webp"
+    img.save(out, "PNG")
+    return "image/png"
+
+
+def placeholder(img: "Image.Image", max_side: int = PLACEHOLDER_MAX_SIDE) -> str:
+    """A data: URI of a tiny version of img (well under 1KB), for the client to show blurred while the real image loads"""
+    from PIL import Image
+
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if img.mode in ("LA", "PA") or "transparency" in img.info else "RGB")
+    scale = max_side / max(img.size)
+    size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+    small = img.resize(size, Image.Resampling.BOX, reducing_gap=2.0) if scale < 1 else img.copy()
+    out = BytesIO()
+    if small.mode == "RGBA":
+        small.save(out, "PNG", optimize=True)
+        mime = "image/png"
+    else:
+        small.save(out, "JPEG", quality=50, optimize=True)
+        mime = "image/jpeg"
+    return f"data:{mime};base64,{base64.b64encode(out.getvalue()).decode()}"
@@ -0,0 +1,202 @@
+"""Async client for OpenAI-compatible chat completion APIs.
+
+One pooled httpx.AsyncClient is shared by every request, so keep-alive
+connections are reused instead of a TLS handshake per completion. Each call has
+an overall deadline covering queueing, retries and backoff. 429 and 5xx
+responses and transport errors are retried with full-jitter exponential
+backoff (honouring Retry-After), and a semaphore caps in-flight calls across
+the process.
+
+Point base_url at benchmarks/mock_llm_server.py to run without network access.
+"""
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class LLMTimeout(LLMError):
+    pass
+
+
+@dataclass
+class ChatResult:
+    text: str
+    model: str
+    usage: dict = field(default_factory=dict)
+    latency: float = 0.0
+    attempts: int = 1
+
+
+class LLMClient:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str],
+        timeout: float = 60.0,
+        connect_timeout: float = 5.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 8.0,
+        max_concurrency: int = 8,
+        max_connections: int = 20,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        # Replaces the network transport, e.g. with httpx.MockTransport in tests
+        self.transport = transport
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _http(self) -> "httpx.AsyncClient":
+        # Created on first use so it binds to the running event loop; httpx is imported
+        # here rather than at module load to keep it out of the server's cold start
+        if self._client is None:
+            import httpx
+
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                transport=self.transport,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+    def _backoff(self, attempt: int, response: Optional["httpx.Response"]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.backoff_cap)
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    async def _post(self, path: str, body: dict, deadline: float, stream: bool = False):
+        """POST with retries; returns the response (still open when streaming) and the attempt count"""
+        import httpx
+
+        client = self._http()
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMTimeout("LLM request deadline exceeded")
+            response = None
+            try:
+                request = client.build_request("POST", path, json=body, timeout=httpx.Timeout(remaining, connect=min(self.connect_timeout, remaining)))
+                response = await asyncio.wait_for(client.send(request, stream=stream), timeout=remaining)
+                if response.status_code < 400:
+                    return response, attempt + 1
+                if stream:
+                    await response.aread()
+                    await response.aclose()
+                error = LLMError(f"LLM provider returned {response.status_code}: {response.text[:200]}", response.status_code)
+                if response.status_code not in RETRYABLE_STATUS:
+                    raise error
+            except (httpx.TimeoutException, asyncio.TimeoutError):
+                error = LLMTimeout("LLM request timed out")
+            except httpx.TransportError as e:
+                error = LLMError(f"LLM transport error: {e}")
+
+            delay = self._backoff(attempt, response)
+            attempt += 1
+            if attempt > self.max_retries or time.monotonic() + delay >= deadline:
+                raise error
+            await asyncio.sleep(delay)
+
+    async def _acquire(self, deadline: float):
+        self._http()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            raise LLMTimeout("Timed out waiting for an LLM slot")
+
+    async def chat(self, model: str, messages: List[dict], timeout: Optional[float] = None, **params) -> ChatResult:
+        started = time.monotonic()
+        deadline = started + (timeout or self.timeout)
+        await self._acquire(deadline)
+        try:
+            response, attempts = await self._post("/chat/completions", {"model": model, "messages": messages, **params}, deadline)
+        finally:
+            self._semaphore.release()
+
+        data = response.json()
+        try:
+            text = data["choices"][0]["message"]["content"] or ""
+        except (KeyError, IndexError, TypeError):
+            raise LLMError("Malformed LLM response")
+        return ChatResult(
+            text=text,
+            model=data.get("model", model),
+            usage=data.get("usage") or {},
+            latency=time.monotonic() - started,
+            attempts=attempts,
+        )
+
+    async def stream_chat(self, model: str, messages: List[dict], timeout: Optional[float] = None, **params) -> AsyncIterator[str]:
+        """Yield content deltas as the model produces them.
+
+        Retries only happen before the first byte of the stream; the deadline
+        still bounds the whole call.
+        """
+        import httpx
+
+        deadline = time.monotonic() + (timeout or self.timeout)
+        await self._acquire(deadline)
+        try:
+            body = {"model": model, "messages": messages, "stream": True, **params}
+            response, _ = await self._post("/chat/completions", body, deadline, stream=True)
+            try:
+                async for line in response.aiter_lines():
+                    if time.monotonic() > deadline:
+                        raise LLMTimeout("LLM stream deadline exceeded")
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                    except (ValueError, KeyError, IndexError):
+                        raise LLMError("Malformed LLM stream chunk")
+                    if delta:
+                        yield delta
+            except httpx.TimeoutException:
+                raise LLMTimeout("LLM stream timed out")
+            except httpx.TransportError as e:
+                raise LLMError(f"LLM stream interrupted: {e}")
+            finally:
+                await response.aclose()
+        finally:
+            self._semaphore.release()
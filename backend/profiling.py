@@ -0,0 +1,188 @@
+"""Opt-in per-request profiling.
+
+A request is profiled when it carries `X-Profile: <PROFILE_TOKEN>` or is
+picked by PROFILE_SAMPLE_RATE. Its response gets an `X-Profile-Id` header,
+and the profile is stored on disk under that id:
+
+- "sample" mode (default) samples the event-loop thread's stack every few
+  milliseconds and keeps collapsed stacks, the input format of flamegraph.pl
+  and speedscope.
+- "cprofile" mode runs cProfile and keeps the pstats dump, for snakeviz or
+  `python -m pstats`.
+
+Either way every SQL statement the request ran is timed. One request is
+profiled at a time; others that ask while it runs are served normally. Both
+modes observe the whole event-loop thread, so time spent on concurrent
+requests can show up in a profile. With no token and a zero sample rate the
+middleware is a single attribute check per request.
+"""
+import contextvars
+import cProfile
+import json
+import marshal
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from io import StringIO
+from pathlib import Path
+from typing import List, Optional
+
+_queries: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("profiled_queries", default=None)
+
+
+def record_query(statement: str, seconds: float):
+    """Called from the SQL timing hooks; a no-op unless the current request is profiled"""
+    queries = _queries.get()
+    if queries is not None:
+        queries.append({"statement": statement[:500], "seconds": round(seconds, 6)})
+
+
+class StackSampler:
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._thread.join()
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Profiles as files in one directory, so any worker on the host can serve them"""
+
+    def __init__(self, directory: Path, max_profiles: int = 100):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def save(self, summary: dict, data: bytes, extension: str):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{summary['id']}{extension}").write_bytes(data)
+        (self.directory / f"{summary['id']}.json").write_text(json.dumps(summary))
+        self._prune()
+
+    def _prune(self):
+        summaries = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for old in summaries[:max(0, len(summaries) - self.max_profiles)]:
+            for path in self.directory.glob(f"{old.stem}.*"):
+                path.unlink(missing_ok=True)
+
+    def list(self) -> List[dict]:
+        summaries = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        return [{k: v for k, v in json.loads(p.read_text()).items() if k != "queries" and k != "top"} for p in summaries]
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        if not profile_id.isalnum():
+            return None
+        path = self.directory / f"{profile_id}.json"
+        return json.loads(path.read_text()) if path.is_file() else None
+
+    def data_path(self, profile_id: str) -> Optional[Path]:
+        summary = self.get(profile_id)
+        if summary is None:
+            return None
+        path = self.directory / f"{profile_id}{summary['format']}"
+        return path if path.is_file() else None
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, store: ProfileStore, token: Optional[str] = None, sample_rate: float = 0.0,
+                 mode: str = "sample", exclude: tuple = ("/metrics", "/api/profiles")):
+        self.app = app
+        self.store = store
+        self.token = token
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.exclude = exclude
+        self.enabled = bool(token) or sample_rate > 0
+        self._busy = threading.Lock()
+
+    def _wanted(self, scope) -> bool:
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude):
+            return False
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == b"x-profile":
+                    return value.decode("latin-1") == self.token
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or not self._wanted(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self._profile(scope, receive, send)
+        finally:
+            self._busy.release()
+
+    async def _profile(self, scope, receive, send):
+        profile_id = uuid.uuid4().hex
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        queries = []
+        token = _queries.set(queries)
+        profiler = cProfile.Profile() if self.mode == "cprofile" else None
+        sampler = None if profiler else StackSampler(threading.get_ident())
+        started = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        else:
+            sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            if profiler:
+                profiler.disable()
+            else:
+                collapsed = sampler.stop()
+            _queries.reset(token)
+            summary = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "duration": round(duration, 6),
+                "created_at": time.time(),
+                "query_count": len(queries),
+                "query_seconds": round(sum(q["seconds"] for q in queries), 6),
+                "queries": queries,
+            }
+            if profiler:
+                top = StringIO()
+                stats = pstats.Stats(profiler, stream=top)
+                stats.sort_stats("cumulative").print_stats(30)
+                summary.update(format=".prof", top=top.getvalue())
+                # Same layout as Stats.dump_stats, so pstats and snakeviz can load it
+                self.store.save(summary, marshal.dumps(stats.stats), ".prof")
+            else:
+                summary.update(format=".folded", top="\n".join(collapsed.splitlines()[:30]))
+                self.store.save(summary, collapsed.encode(), ".folded")
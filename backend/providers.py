@@ -0,0 +1,338 @@
+"""AI provider abstraction with latency tracking, hedged requests and fallback.
+
+Text and image generation go through a ProviderPool holding one or more
+providers in preference order. Each provider keeps a window of recent
+latencies and failures. A call starts on the healthiest provider; if it hasn't
+answered within that provider's p95 latency, a hedged request is sent to the
+next provider and whichever finishes first wins (the loser is cancelled). A
+failure falls through to the next provider immediately.
+
+Provider SDKs are imported on first use, so configuring a provider costs
+nothing at startup.
+"""
+import asyncio
+import base64
+import logging
+import time
+import uuid
+from collections import deque
+from io import BytesIO
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from llm_client import ChatResult, LLMClient
+from reference_images import ReferenceImage
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderError(Exception):
+    pass
+
+
+class LatencyTracker:
+    """Sliding window of recent call outcomes for one provider"""
+
+    def __init__(self, window: int = 200, cooldown: float = 30.0):
+        self.latencies = deque(maxlen=window)
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.failed_at = 0.0
+
+    def record_success(self, latency: float):
+        self.latencies.append(latency)
+        self.consecutive_failures = 0
+
+    def record_cancelled(self, elapsed: float):
+        # A hedged call that lost was at least this slow; keeping it stops p95 from drifting down
+        self.latencies.append(elapsed)
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.failed_at = time.monotonic()
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    @property
+    def healthy(self) -> bool:
+        return self.consecutive_failures < 3 or time.monotonic() - self.failed_at > self.cooldown
+
+
+class TextProvider:
+    name = "text"
+    model = ""
+
+    def __init__(self):
+        self.tracker = LatencyTracker()
+
+    async def complete(self, messages: List[dict]) -> ChatResult:
+        raise NotImplementedError
+
+    async def stream(self, messages: List[dict]) -> AsyncIterator[str]:
+        # Providers without native streaming yield the whole completion at once
+        result = await self.complete(messages)
+        yield result.text
+
+
+class ImageProvider:
+    name = "image"
+    model = ""
+
+    def __init__(self):
+        self.tracker = LatencyTracker()
+
+    async def generate(self, prompt: str, reference: ReferenceImage) -> bytes:
+        raise NotImplementedError
+
+
+class OpenAITextProvider(TextProvider):
+    """Any OpenAI-compatible chat completions API, via the shared pooled LLMClient"""
+    name = "openai"
+
+    def __init__(self, client: LLMClient, model: str):
+        super().__init__()
+        self.client = client
+        self.model = model
+
+    async def complete(self, messages: List[dict]) -> ChatResult:
+        return await self.client.chat(self.model, messages)
+
+    async def stream(self, messages: List[dict]) -> AsyncIterator[str]:
+        async for delta in self.client.stream_chat(self.model, messages):
+            yield delta
+
+
+class EmergentTextProvider(TextProvider):
+    name = "emergent"
+
+    def __init__(self, api_key: str, vendor: str = "openai", model: str = "gpt-5.2"):
+        super().__init__()
+        self.api_key = api_key
+        self.vendor = vendor
+        self.model = model
+
+    async def complete(self, messages: List[dict]) -> ChatResult:
+        from emergentintegrations.llm.chat import LlmChat, UserMessage
+
+        started = time.monotonic()
+        system = next((m["content"] for m in messages if m["role"] == "system"), "")
+        prompt = "\n\n".join(m["content"] for m in messages if m["role"] != "system")
+        chat = LlmChat(api_key=self.api_key, session_id=f"content_gen_{uuid.uuid4()}", system_message=system)
+        chat.with_model(self.vendor, self.model)
+        text = await chat.send_message(UserMessage(text=prompt))
+        return ChatResult(text=text, model=self.model, latency=time.monotonic() - started)
+
+
+class GeminiImageProvider(ImageProvider):
+    name = "gemini"
+
+    def __init__(self, api_key: str, model: str = "gemini-2.0-flash-preview-image-generation"):
+        super().__init__()
+        self.api_key = api_key
+        self.model = model
+        self._client = None
+
+    def _generate_sync(self, prompt: str, reference: ReferenceImage) -> bytes:
+        import google.generativeai as genai
+        from PIL import Image
+
+        if self._client is None:
+            genai.configure(api_key=self.api_key)
+            self._client = genai.GenerativeModel(self.model)
+        response = self._client.generate_content(
+            [prompt, Image.open(BytesIO(reference.data))],
+            generation_config={"response_modalities": ["TEXT", "IMAGE"]}
+        )
+        for candidate in response.candidates:
+            for part in candidate.content.parts:
+                inline = getattr(part, "inline_data", None)
+                if inline and inline.data:
+                    return inline.data
+        raise ProviderError("Gemini returned no image")
+
+    async def generate(self, prompt: str, reference: ReferenceImage) -> bytes:
+        # The SDK is synchronous; keep it off the event loop
+        return await asyncio.to_thread(self._generate_sync, prompt, reference)
+
+
+class EmergentImageProvider(ImageProvider):
+    name = "emergent"
+
+    def __init__(self, api_key: str, model: str = "gemini-3-pro-image-preview"):
+        super().__init__()
+        self.api_key = api_key
+        self.model = model
+
+    async def generate(self, prompt: str, reference: ReferenceImage) -> bytes:
+        from emergentintegrations.llm.chat import ImageContent, LlmChat, UserMessage
+
+        chat = LlmChat(
+            api_key=self.api_key,
+            session_id=f"image_gen_{uuid.uuid4()}",
+            system_message="You are an expert at creating professional product photography backgrounds."
+        )
+        chat.with_model("gemini", self.model).with_params(modalities=["image", "text"])
+        message = UserMessage(text=prompt, file_contents=[ImageContent(reference.base64)])
+        _, images = await chat.send_message_multimodal_response(message)
+        if not images:
+            raise ProviderError("No image generated")
+        return base64.b64decode(images[0]["data"])
+
+
+class ProviderPool:
+    def __init__(
+        self,
+        providers: list,
+        hedging: bool = True,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        hedge_default_delay: float = 10.0,
+        hedge_min_delay: float = 0.25,
+        observer: Optional[Callable[[object, str, float], None]] = None,
+    ):
+        self.providers = providers
+        # observer(provider, outcome, seconds) sees every attempt: "ok", "error" or "cancelled"
+        self.observer = observer
+        self.hedging = hedging
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_default_delay = hedge_default_delay
+        self.hedge_min_delay = hedge_min_delay
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.fallbacks = 0
+
+    def __bool__(self):
+        return bool(self.providers)
+
+    @property
+    def names(self) -> List[str]:
+        return [p.name for p in self.providers]
+
+    def ranked(self) -> list:
+        """Healthy providers first, fastest median first once there is data, else configured order"""
+        def key(item):
+            position, provider = item
+            median = provider.tracker.quantile(0.5)
+            enough = len(provider.tracker.latencies) >= self.hedge_min_samples
+            return (not provider.tracker.healthy, median if enough else float("inf"), position)
+        return [p for _, p in sorted(enumerate(self.providers), key=key)]
+
+    def hedge_delay(self, provider) -> float:
+        tracker = provider.tracker
+        if len(tracker.latencies) < self.hedge_min_samples:
+            return self.hedge_default_delay
+        return max(self.hedge_min_delay, tracker.quantile(self.hedge_quantile))
+
+    def _observe(self, provider, outcome: str, seconds: float):
+        if self.observer is not None:
+            self.observer(provider, outcome, seconds)
+
+    async def _timed(self, provider, op: Callable[..., Awaitable[T]]) -> T:
+        started = time.monotonic()
+        try:
+            result = await op(provider)
+        except asyncio.CancelledError:
+            provider.tracker.record_cancelled(time.monotonic() - started)
+            self._observe(provider, "cancelled", time.monotonic() - started)
+            raise
+        except Exception:
+            provider.tracker.record_failure()
+            self._observe(provider, "error", time.monotonic() - started)
+            raise
+        provider.tracker.record_success(time.monotonic() - started)
+        self._observe(provider, "ok", time.monotonic() - started)
+        return result
+
+    async def call(self, op: Callable[..., Awaitable[T]]) -> Tuple[T, object]:
+        """Run op(provider) with hedging and fallback; returns (result, provider that answered)"""
+        if not self.providers:
+            raise ProviderError("No provider configured")
+        candidates = self.ranked()
+        pending = {}
+        errors = []
+        launched = 0
+
+        def launch(role: str):
+            nonlocal launched
+            provider = candidates[launched]
+            launched += 1
+            pending[asyncio.ensure_future(self._timed(provider, op))] = (provider, role)
+
+        launch("primary")
+        try:
+            while pending:
+                can_hedge = self.hedging and launched < len(candidates) and len(pending) == 1
+                timeout = self.hedge_delay(candidates[launched - 1]) if can_hedge else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self.hedges += 1
+                    launch("hedge")
+                    continue
+                for task in done:
+                    provider, role = pending.pop(task)
+                    if task.exception() is None:
+                        if role == "hedge":
+                            self.hedge_wins += 1
+                        return task.result(), provider
+                    errors.append(f"{provider.name}: {task.exception()}")
+                    logger.warning(f"Provider {provider.name} failed: {task.exception()}")
+                if not pending and launched < len(candidates):
+                    self.fallbacks += 1
+                    launch("fallback")
+        finally:
+            for task in pending:
+                task.cancel()
+        raise ProviderError("All providers failed: " + "; ".join(errors))
+
+    async def stream(self, messages: List[dict], meta: Optional[dict] = None) -> AsyncIterator[str]:
+        """Stream from the best provider, falling back only if it fails before the first chunk.
+
+        If given, meta["provider"] is set to the provider currently streaming.
+        """
+        errors = []
+        for provider in self.ranked():
+            if meta is not None:
+                meta["provider"] = provider
+            started = time.monotonic()
+            emitted = False
+            try:
+                async for delta in provider.stream(messages):
+                    emitted = True
+                    yield delta
+            except Exception as e:
+                provider.tracker.record_failure()
+                self._observe(provider, "error", time.monotonic() - started)
+                if emitted:
+                    raise
+                errors.append(f"{provider.name}: {e}")
+                self.fallbacks += 1
+                continue
+            provider.tracker.record_success(time.monotonic() - started)
+            self._observe(provider, "ok", time.monotonic() - started)
+            return
+        raise ProviderError("All providers failed: " + "; ".join(errors))
+
+    def stats(self) -> dict:
+        return {
+            "providers": [
+                {
+                    "name": p.name,
+                    "model": p.model,
+                    "samples": len(p.tracker.latencies),
+                    "p50": p.tracker.quantile(0.5),
+                    "p95": p.tracker.quantile(0.95),
+                    "healthy": p.tracker.healthy,
+                    "hedge_delay": self.hedge_delay(p),
+                }
+                for p in self.providers
+            ],
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "fallbacks": self.fallbacks,
+        }
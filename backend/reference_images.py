@@ -0,0 +1,126 @@
+"""Preparation of reference images sent to AI image providers.
+
+Processed images can be tens of megabytes (enhance_image doubles both sides),
+but image models downscale their inputs to around a megapixel anyway. Before
+a reference goes to a provider it is downsized to REFERENCE_IMAGE_MAX_SIDE and
+re-encoded: PNG when it has transparency (the cut-out matters to the model),
+JPEG otherwise. Prepared payloads, and their base64 form once a provider asks
+for it, are cached per content hash, so regenerating backgrounds for the same
+image skips the decode/resize/encode entirely.
+"""
+import base64
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, Tuple
+
+_HASH_CHUNK = 1024 * 1024
+
+
+class ReferenceImage:
+    def __init__(self, data: bytes, mime: str, size: Tuple[int, int], digest: str):
+        self.data = data
+        self.mime = mime
+        self.size = size
+        self.digest = digest
+        self._base64: Optional[str] = None
+
+    @property
+    def base64(self) -> str:
+        if self._base64 is None:
+            self._base64 = base64.b64encode(self.data).decode("ascii")
+        return self._base64
+
+    @property
+    def cost(self) -> int:
+        return len(self.data) + (len(self._base64) if self._base64 else 0)
+
+
+def file_digest(path: Path) -> str:
+    """sha256 of a file, read in chunks so large images aren't loaded whole"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def encode_reference(path: Path, max_side: int, jpeg_quality: int = 90) -> Tuple[bytes, str, Tuple[int, int]]:
+    from PIL import Image
+
+    with Image.open(path) as img:
+        # For JPEG sources this lets the decoder skip detail we would throw away
+        img.draft("RGB", (max_side, max_side))
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha else "RGB")
+        img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+        out = BytesIO()
+        if has_alpha:
+            img.save(out, "PNG", compress_level=6)
+            return out.getvalue(), "image/png", img.size
+        img.save(out, "JPEG", quality=jpeg_quality, optimize=True)
+        return out.getvalue(), "image/jpeg", img.size
+
+
+class ReferenceImageCache:
+    def __init__(self, max_side: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_side = max_side
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, ReferenceImage]" = OrderedDict()
+        # Uploaded files are never rewritten in place, so (path, mtime, size) identifies content
+        self._digests: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _digest(self, path: Path) -> str:
+        stat = os.stat(path)
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            digest = self._digests.get(key)
+        if digest is None:
+            digest = file_digest(path)
+            with self._lock:
+                self._digests[key] = digest
+                while len(self._digests) > 4096:
+                    self._digests.popitem(last=False)
+        return digest
+
+    def get(self, path: Path) -> ReferenceImage:
+        """Blocking (hashing, decoding, encoding); call from a worker thread"""
+        digest = self._digest(path)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        data, mime, size = encode_reference(path, self.max_side)
+        entry = ReferenceImage(data, mime, size, digest)
+        with self._lock:
+            self._entries[digest] = entry
+            self._evict()
+        return entry
+
+    def _evict(self):
+        total = sum(e.cost for e in self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            total -= evicted.cost
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(e.cost for e in self._entries.values()),
+                "max_bytes": self.max_bytes,
+                "max_side": self.max_side,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,85 @@
+"""Compact storage for project copy revisions.
+
+Each revision stores ai_title/ai_description either as a full snapshot or as a
+delta against the previous revision. Deltas are a list of ops: a positive int
+copies that many characters from the previous text, a negative int skips that
+many, and a string is inserted verbatim. Payloads are zlib-compressed JSON.
+
+A snapshot is written every SNAPSHOT_INTERVAL revisions so rebuilding any
+revision replays at most SNAPSHOT_INTERVAL - 1 deltas.
+"""
+import json
+import re
+import zlib
+from difflib import SequenceMatcher
+from typing import List, Optional, Tuple
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+SNAPSHOT_INTERVAL = 10
+
+FIELDS = (("t", "ai_title"), ("d", "ai_description"))
+
+_TOKEN = re.compile(r"\s+|\S+")
+
+
+def diff_text(old: str, new: str) -> list:
+    # Diff word tokens rather than characters: far cheaper on long descriptions
+    # and edits to generated copy land on word boundaries anyway.
+    a = _TOKEN.findall(old)
+    b = _TOKEN.findall(new)
+    ops = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append(sum(len(t) for t in a[i1:i2]))
+            continue
+        if i2 > i1:
+            ops.append(-sum(len(t) for t in a[i1:i2]))
+        if j2 > j1:
+            ops.append("".join(b[j1:j2]))
+    return ops
+
+
+def patch_text(old: str, ops: list) -> str:
+    out = []
+    pos = 0
+    for op in ops:
+        if isinstance(op, str):
+            out.append(op)
+        elif op >= 0:
+            out.append(old[pos:pos + op])
+            pos += op
+        else:
+            pos -= op
+    return "".join(out)
+
+
+def _pack(data: dict) -> bytes:
+    return zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def _unpack(payload: bytes) -> dict:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+def encode_revision(revision: int, content: dict, previous: Optional[dict]) -> Tuple[str, bytes]:
+    """Return (kind, payload) for `content` given the previous revision's content."""
+    if previous is None or revision % SNAPSHOT_INTERVAL == 1:
+        return SNAPSHOT, _pack({key: content.get(field) or "" for key, field in FIELDS})
+    return DELTA, _pack({
+        key: diff_text(previous.get(field) or "", content.get(field) or "")
+        for key, field in FIELDS
+    })
+
+
+def decode_revisions(chain: List[Tuple[str, bytes]]) -> dict:
+    """Rebuild content from a snapshot followed by the deltas up to the target revision."""
+    content = {field: "" for _, field in FIELDS}
+    for kind, payload in chain:
+        data = _unpack(payload)
+        for key, field in FIELDS:
+            if kind == SNAPSHOT:
+                content[field] = data[key]
+            else:
+                content[field] = patch_text(content[field], data[key])
+    return content
@@ -0,0 +1,112 @@
+"""Coalescing of identical in-flight requests.
+
+Concurrent calls with the same key share one execution: the first caller runs
+the function and everyone else awaits its result. The work runs in its own
+task, so a leader whose client disconnects doesn't fail the followers.
+
+With a shared backend (Redis, when REDIS_URL is configured) the same holds
+across uvicorn workers: the leader takes a short-lived lock and publishes its
+JSON result; followers in other workers poll for it. If the leader fails or
+its lock expires without a result, a follower takes over and runs the call
+itself. Results on that path must be JSON-serializable.
+"""
+import asyncio
+import json
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class RedisFlightBackend:
+    # Only delete the lock if we still own it
+    _RELEASE = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, url: str, prefix: str = "singleflight:"):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    async def acquire(self, key: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        if await self.client.set(f"{self.prefix}lock:{key}", token, nx=True, px=int(ttl * 1000)):
+            return token
+        return None
+
+    async def release(self, key: str, token: str):
+        await self.client.eval(self._RELEASE, 1, f"{self.prefix}lock:{key}", token)
+
+    async def locked(self, key: str) -> bool:
+        return bool(await self.client.exists(f"{self.prefix}lock:{key}"))
+
+    async def publish(self, key: str, result: Any, ttl: float):
+        await self.client.set(f"{self.prefix}result:{key}", json.dumps(result), px=int(ttl * 1000))
+
+    async def result(self, key: str) -> Optional[Any]:
+        value = await self.client.get(f"{self.prefix}result:{key}")
+        return json.loads(value) if value is not None else None
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+class SingleFlight:
+    def __init__(self, backend=None, lock_ttl: float = 120.0, result_ttl: float = 30.0, poll_interval: float = 0.1):
+        self.backend = backend
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.remote_coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Returns (result, shared); shared is True if another caller did the work"""
+        call = self._calls.get(key)
+        if call is not None:
+            self.coalesced += 1
+            result, shared = await asyncio.shield(call)
+            return result, True
+
+        call = asyncio.ensure_future(self._run(key, fn))
+        self._calls[key] = call
+        call.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(call)
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        if self.backend is None:
+            self.leaders += 1
+            return await fn(), False
+
+        while True:
+            token = await self.backend.acquire(key, self.lock_ttl)
+            if token:
+                break
+            while await self.backend.locked(key):
+                await asyncio.sleep(self.poll_interval)
+            result = await self.backend.result(key)
+            if result is not None:
+                self.remote_coalesced += 1
+                return result, True
+            # The leader failed or timed out without a result; try to take over
+
+        self.leaders += 1
+        try:
+            result = await fn()
+            await self.backend.publish(key, result, self.result_ttl)
+            return result, False
+        finally:
+            await self.backend.release(key, token)
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__ if self.backend else "local",
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "remote_coalesced": self.remote_coalesced,
+        }
+
+    async def aclose(self):
+        if self.backend is not None:
+            await self.backend.aclose()
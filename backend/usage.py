@@ -0,0 +1,88 @@
+"""Accounting of AI provider calls: latency, tokens, image bytes and cost.
+
+Every AI request records one row: provider, model, status, latency, token
+counts and an estimated cost from a per-model price table. Rows are buffered
+in memory and written in bulk by a background flush, so accounting adds no
+database round trip to the request path. Cached and coalesced requests are
+recorded too, with zero cost, so call volume per user stays visible.
+"""
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+# USD per million tokens for text models, per generated image for image models.
+# Override or extend with AI_PRICES_JSON, e.g. '{"my-model": {"input": 1.0, "output": 2.0}}'.
+DEFAULT_PRICES = {
+    "gpt-4": {"input": 30.0, "output": 60.0},
+    "gpt-4-turbo": {"input": 10.0, "output": 30.0},
+    "gpt-4o": {"input": 2.5, "output": 10.0},
+    "gpt-4o-mini": {"input": 0.15, "output": 0.6},
+    "gemini-2.0-flash-preview-image-generation": {"image": 0.039},
+}
+
+
+def load_prices(override_json: Optional[str] = None) -> dict:
+    prices = dict(DEFAULT_PRICES)
+    if override_json:
+        prices.update(json.loads(override_json))
+    return prices
+
+
+def estimate_cost(prices: dict, model: Optional[str], input_tokens: int = 0, output_tokens: int = 0, images: int = 0) -> Optional[float]:
+    """None when the model has no known price, so unknown cost isn't reported as free"""
+    price = prices.get(model or "")
+    if price is None:
+        return None
+    return (
+        input_tokens * price.get("input", 0.0) / 1_000_000
+        + output_tokens * price.get("output", 0.0) / 1_000_000
+        + images * price.get("image", 0.0)
+    )
+
+
+class UsageRecorder:
+    def __init__(self, prices: dict):
+        self.prices = prices
+        self._pending: List[dict] = []
+
+    def record(
+        self,
+        user_id: str,
+        operation: str,
+        status: str,
+        latency: float,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        image_bytes_in: int = 0,
+        image_bytes_out: int = 0,
+        request_key: Optional[str] = None,
+        error: Optional[str] = None,
+    ):
+        now = time.time()
+        billable = status == "ok"
+        self._pending.append({
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "day": datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d"),
+            "created_at": now,
+            "operation": operation,
+            "status": status,
+            "provider": provider,
+            "model": model,
+            "latency": latency,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "image_bytes_in": image_bytes_in,
+            "image_bytes_out": image_bytes_out,
+            "cost": estimate_cost(self.prices, model, input_tokens, output_tokens, 1 if image_bytes_out else 0) if billable else 0.0,
+            "request_key": request_key,
+            "error": error[:500] if error else None,
+        })
+
+    def drain(self) -> List[dict]:
+        rows, self._pending = self._pending, []
+        return rows
@@ -12,6 +12,38 @@ import axios from "axios";
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
+// Paints the project's inline placeholder (a tiny data: URI from the listing,
+// blurred) at once, and swaps to the real image when it has loaded.
+function ProjectThumbnail({ project }) {
+  const [loaded, setLoaded] = useState(false);
+  const src = project.processed_image_url || project.processed_image || project.original_image_url || project.original_image;
+
+  if (!src && !project.image_placeholder) {
+    return <LayoutGrid className="w-12 h-12 text-slate-300" />;
+  }
+  return (
+    <div className="relative w-full h-full">
+      {project.image_placeholder && !loaded && (
+        <img
+          src={project.image_placeholder}
+          alt=""
+          aria-hidden="true"
+          className="absolute inset-0 w-full h-full object-cover blur-md scale-110"
+        />
+      )}
+      {src && (
+        <img
+          src={src}
+          alt={project.name}
+          loading="lazy"
+          onLoad={() => setLoaded(true)}
+          className={`relative w-full h-full object-cover transition-opacity duration-300 ${loaded ? 'opacity-100' : 'opacity-0'}`}
+        />
+      )}
+    </div>
+  );
+}
+
 export default function Dashboard() {
   const navigate = useNavigate();
   const [projects, setProjects] = useState([]);
@@ -128,15 +160,7 @@ export default function Dashboard() {
                 onClick={() => navigate(`/editor/${project.id}`)}
               >
                 <div className="aspect-video bg-slate-100 rounded-lg mb-4 flex items-center justify-center overflow-hidden">
-                  {project.processed_image || project.original_image ? (
-                    <img 
-                      src={project.processed_image || project.original_image} 
-                      alt={project.name}
-                      className="w-full h-full object-cover"
-                    />
-                  ) : (
-                    <LayoutGrid className="w-12 h-12 text-slate-300" />
-                  )}
+                  <ProjectThumbnail project={project} />
                 </div>
                 <h3 className="text-lg font-medium mb-1" style={{ fontFamily: 'Outfit, sans-serif', color: '#0F172A' }}>
                   {project.name}
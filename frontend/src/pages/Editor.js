@@ -1,6 +1,6 @@
 import { useState, useEffect, useRef } from "react";
 import { useParams, useNavigate } from "react-router-dom";
-import { ArrowLeft, Upload, Sparkles, Scissors, Layers, Zap, Download, Save } from "lucide-react";
+import { ArrowLeft, Upload, Sparkles, Scissors, Layers, Zap, Download, Save, Package } from "lucide-react";
 import { Button } from "@/components/ui/button";
 import { Card } from "@/components/ui/card";
 import { Input } from "@/components/ui/input";
@@ -43,8 +43,10 @@ export default function Editor() {
       });
       const proj = response.data;
       setProject(proj);
-      if (proj.original_image) setOriginalImage(proj.original_image);
-      if (proj.processed_image) setProcessedImage(proj.processed_image);
+      const original = proj.original_image_url || proj.original_image;
+      const processed = proj.processed_image_url || proj.processed_image;
+      if (original) setOriginalImage(original);
+      if (processed) setProcessedImage(processed);
       if (proj.ai_title) setAiTitle(proj.ai_title);
       if (proj.ai_description) setAiDescription(proj.ai_description);
     } catch (error) {
@@ -88,6 +90,85 @@ export default function Editor() {
     }
   };
 
+  // Posts the current image as raw bytes to a stateless image endpoint and
+  // shows the binary result through an object URL (no base64 either way).
+  const runImageOperation = async (path) => {
+    const source = await (await fetch(processedImage)).blob();
+    const response = await axios.post(`${API}${path}`, source, {
+      headers: {
+        Authorization: `Bearer ${token}`,
+        'Content-Type': source.type || 'application/octet-stream'
+      },
+      responseType: 'blob'
+    });
+    if (processedImage.startsWith('blob:') && processedImage !== originalImage) {
+      URL.revokeObjectURL(processedImage);
+    }
+    setProcessedImage(URL.createObjectURL(response.data));
+  };
+
+  // Projects with a server-side image are edited over a WebSocket session: the
+  // server answers each operation with a low-resolution preview right away and
+  // sends the saved full-resolution URL once it has rendered in the background.
+  const sessionRef = useRef(null);
+
+  useEffect(() => () => sessionRef.current?.then((ws) => ws.close(), () => {}), [projectId]);
+
+  const showImage = (url) => {
+    setProcessedImage((previous) => {
+      if (previous?.startsWith('blob:')) URL.revokeObjectURL(previous);
+      return url;
+    });
+  };
+
+  const openEditingSession = () => new Promise((resolve, reject) => {
+    const ws = new WebSocket(`${API.replace(/^http/, 'ws')}/projects/${projectId}/session`);
+    const pending = {};
+    let preview = null;
+    ws.binaryType = 'blob';
+    ws.onopen = () => ws.send(JSON.stringify({ type: 'auth', token }));
+    ws.onmessage = (event) => {
+      if (typeof event.data !== 'string') {
+        if (preview) showImage(URL.createObjectURL(event.data));
+        pending[preview?.seq]?.resolve();
+        preview = null;
+        return;
+      }
+      const message = JSON.parse(event.data);
+      if (message.type === 'ready') {
+        ws.apply = (op) => new Promise((done, fail) => {
+          const seq = (ws.seq = (ws.seq || 0) + 1);
+          pending[seq] = { resolve: done, reject: fail };
+          ws.send(JSON.stringify({ op, seq }));
+        });
+        resolve(ws);
+      } else if (message.type === 'preview') {
+        preview = message;
+      } else if (message.type === 'full') {
+        showImage(message.processed_image_url);
+      } else if (message.type === 'error') {
+        pending[message.seq]?.reject(new Error(message.detail));
+        toast.error(message.detail);
+      }
+    };
+    ws.onclose = () => {
+      sessionRef.current = null;
+      const closed = new Error('Editing session closed');
+      Object.values(pending).forEach(({ reject: fail }) => fail(closed));
+      reject(closed);
+    };
+  });
+
+  const applyImageOperation = async (op, path) => {
+    if (!projectId || !project?.processed_image_url) {
+      await runImageOperation(path);
+      return;
+    }
+    if (!sessionRef.current) sessionRef.current = openEditingSession();
+    const ws = await sessionRef.current;
+    await ws.apply(op);
+  };
+
   const handleRemoveBackground = async () => {
     if (!processedImage) {
       toast.error('Please upload an image first');
@@ -97,22 +178,8 @@ export default function Editor() {
     setLoading(true);
     setActiveOperation('remove-bg');
     try {
-      const response = await axios.post(
-        `${API}/image/remove-background`,
-        { image: processedImage },
-        { headers: { Authorization: `Bearer ${token}` } }
-      );
-
-      setProcessedImage(response.data.image);
+      await applyImageOperation('remove_background', '/image/remove-background');
       toast.success('Background removed!');
-
-      if (projectId) {
-        await axios.put(
-          `${API}/projects/${projectId}`,
-          { processed_image: response.data.image },
-          { headers: { Authorization: `Bearer ${token}` } }
-        );
-      }
     } catch (error) {
       toast.error('Background removal failed');
     } finally {
@@ -164,22 +231,8 @@ export default function Editor() {
     setLoading(true);
     setActiveOperation('enhance');
     try {
-      const response = await axios.post(
-        `${API}/image/enhance`,
-        { image: processedImage },
-        { headers: { Authorization: `Bearer ${token}` } }
-      );
-
-      setProcessedImage(response.data.image);
+      await applyImageOperation('enhance', '/image/enhance');
       toast.success('Image enhanced!');
-
-      if (projectId) {
-        await axios.put(
-          `${API}/projects/${projectId}`,
-          { processed_image: response.data.image },
-          { headers: { Authorization: `Bearer ${token}` } }
-        );
-      }
     } catch (error) {
       toast.error('Enhancement failed');
     } finally {
@@ -188,6 +241,41 @@ export default function Editor() {
     }
   };
 
+  // Reads the server-sent events from /content/generate/stream, calling onDelta
+  // for each title/description fragment; resolves with the final parsed content.
+  const streamContent = async (body, onDelta) => {
+    const response = await fetch(`${API}/content/generate/stream`, {
+      method: 'POST',
+      headers: { Authorization: `Bearer ${token}`, 'Content-Type': 'application/json' },
+      body: JSON.stringify(body)
+    });
+    if (!response.ok) {
+      const error = await response.json().catch(() => ({}));
+      throw new Error(error.detail || 'Content generation failed');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const raw = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        const event = raw.match(/^event: (.*)$/m)?.[1];
+        const data = JSON.parse(raw.match(/^data: (.*)$/m)?.[1] || '{}');
+        if (event === 'done') return data;
+        if (event === 'error') throw new Error(data.detail);
+        onDelta(event, data.delta);
+      }
+    }
+    throw new Error('Content stream ended unexpectedly');
+  };
+
   const handleGenerateContent = async () => {
     if (!productType) {
       toast.error('Please enter a product type');
@@ -196,26 +284,30 @@ export default function Editor() {
 
     setLoading(true);
     setActiveOperation('gen-content');
+    setAiTitle("");
+    setAiDescription("");
     try {
-      const response = await axios.post(
-        `${API}/content/generate`,
+      const content = await streamContent(
         { product_type: productType, key_features: keyFeatures },
-        { headers: { Authorization: `Bearer ${token}` } }
+        (section, delta) => {
+          if (section === 'title') setAiTitle((text) => text + delta);
+          else setAiDescription((text) => text + delta);
+        }
       );
 
-      setAiTitle(response.data.title);
-      setAiDescription(response.data.description);
+      setAiTitle(content.title);
+      setAiDescription(content.description);
       toast.success('Content generated!');
 
       if (projectId) {
         await axios.put(
           `${API}/projects/${projectId}`,
-          { ai_title: response.data.title, ai_description: response.data.description },
+          { ai_title: content.title, ai_description: content.description },
           { headers: { Authorization: `Bearer ${token}` } }
         );
       }
     } catch (error) {
-      toast.error(error.response?.data?.detail || 'Content generation failed');
+      toast.error(error.response?.data?.detail || error.message || 'Content generation failed');
     } finally {
       setLoading(false);
       setActiveOperation('');
@@ -235,6 +327,28 @@ export default function Editor() {
     toast.success('Image downloaded!');
   };
 
+  // The server streams the ZIP (every A+ module size plus the copy) as it renders
+  const handleExport = async () => {
+    setActiveOperation('export');
+    try {
+      const response = await axios.get(`${API}/projects/${projectId}/export`, {
+        headers: { Authorization: `Bearer ${token}` },
+        responseType: 'blob'
+      });
+      const url = URL.createObjectURL(response.data);
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = `${project?.name || 'project'}-aplus.zip`;
+      link.click();
+      URL.revokeObjectURL(url);
+      toast.success('A+ package exported!');
+    } catch (error) {
+      toast.error('Export failed');
+    } finally {
+      setActiveOperation('');
+    }
+  };
+
   const handleSave = async () => {
     if (!projectId) return;
 
@@ -379,6 +493,18 @@ export default function Editor() {
                     <Download className="w-4 h-4 mr-2" />
                     Download
                   </Button>
+                  {projectId && (
+                    <Button
+                      data-testid="export-package-btn"
+                      onClick={handleExport}
+                      disabled={activeOperation === 'export'}
+                      variant="outline"
+                      className="flex-1"
+                    >
+                      <Package className="w-4 h-4 mr-2" />
+                      {activeOperation === 'export' ? 'Exporting...' : 'Export A+ package'}
+                    </Button>
+                  )}
                 </div>
               </div>
             ) : (
@@ -26,15 +26,13 @@ if exist requirements.txt (
 
 echo.
 echo Step 2: Installing PostgreSQL version...
-if exist server_postgres.py (
-    copy /Y server_postgres.py server.py
-    echo [OK] Installed new server.py
-) else (
-    echo [ERROR] server_postgres.py not found!
-    echo Please make sure you have the PostgreSQL files.
+REM server.py supports PostgreSQL directly through DATABASE_URL; server_postgres.py only re-exports it
+if not exist server.py (
+    echo [ERROR] server.py not found!
     pause
     exit /b 1
 )
+echo [OK] server.py supports PostgreSQL
 
 if exist requirements_postgres.txt (
     copy /Y requirements_postgres.txt requirements.txt
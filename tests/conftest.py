@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# server reads these at import time; never let tests touch a real database or uploads folder
+_scratch = Path(tempfile.mkdtemp(prefix="aplus-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_scratch}/test.db"
+os.environ["UPLOAD_DIR"] = str(_scratch / "uploads")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("JWT_SECRET", "test-secret-that-is-long-enough-for-hs256")
+
+
+@pytest.fixture(scope="session")
+def server_module():
+    import server
+
+    return server
+
+
+@pytest.fixture
+def client(server_module):
+    from fastapi.testclient import TestClient
+
+    with TestClient(server_module.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def signup(client):
+    """Create a user and return its bearer headers"""
+    count = [0]
+
+    def create(password="pw123456"):
+        count[0] += 1
+        email = f"user{count[0]}-{os.urandom(4).hex()}@example.com"
+        response = client.post("/api/auth/signup", json={"email": email, "password": password})
+        assert response.status_code == 200, response.text
+        return email, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return create
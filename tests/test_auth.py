@@ -0,0 +1,134 @@
+import time
+
+import jwt
+import pytest
+
+from auth import Authenticator, InvalidToken, RevocationList, TokenCache, UserContext
+
+
+def make_user(user_id="u1", token_id="t1", issued_at=1000.0, expires_at=None):
+    return UserContext(user_id=user_id, email=None, token_id=token_id, issued_at=issued_at,
+                       expires_at=expires_at if expires_at is not None else time.time() + 3600)
+
+
+def test_token_cache_hits_until_expiry():
+    cache = TokenCache(maxsize=10)
+    user = make_user(expires_at=2000.0)
+    cache.put("token", user)
+
+    assert cache.get("token", 1999.0) is user
+    assert cache.get("token", 2000.0) is None
+    assert len(cache) == 0
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(maxsize=2)
+    cache.put("a", make_user(token_id="a"))
+    cache.put("b", make_user(token_id="b"))
+    cache.get("a", 0)
+    cache.put("c", make_user(token_id="c"))
+
+    assert cache.get("b", 0) is None
+    assert cache.get("a", 0) is not None and cache.get("c", 0) is not None
+
+
+def test_token_cache_discards_every_token_of_a_user():
+    cache = TokenCache()
+    cache.put("a", make_user(user_id="u1", token_id="a"))
+    cache.put("b", make_user(user_id="u1", token_id="b"))
+    cache.put("c", make_user(user_id="u2", token_id="c"))
+    cache.discard_user("u1")
+
+    assert cache.get("a", 0) is None and cache.get("b", 0) is None
+    assert cache.get("c", 0) is not None
+
+
+def test_revocation_by_token_id_and_prune():
+    revocations = RevocationList()
+    revocations.revoke_token("t1", expires_at=2000.0)
+
+    assert revocations.is_revoked(make_user(token_id="t1"))
+    assert not revocations.is_revoked(make_user(token_id="t2"))
+    revocations.prune(2000.0)
+    assert not revocations.is_revoked(make_user(token_id="t1"))
+
+
+def test_user_cutoff_spares_tokens_issued_in_the_cutoff_second():
+    revocations = RevocationList()
+    revocations.revoke_user("u1", 1000.0)
+
+    assert revocations.is_revoked(make_user(issued_at=999.0))
+    assert not revocations.is_revoked(make_user(issued_at=1000.0))
+    assert not revocations.is_revoked(make_user(user_id="u2", issued_at=999.0))
+    # An older cut-off never moves an existing one back
+    revocations.revoke_user("u1", 500.0)
+    assert revocations.is_revoked(make_user(issued_at=999.0))
+
+
+SECRET = "test-secret-that-is-long-enough-for-hs256"
+
+
+def test_authenticator_caches_verified_tokens_and_rejects_revoked_ones():
+    authenticator = Authenticator(SECRET, "HS256")
+    token = jwt.encode({"user_id": "u1", "jti": "t1", "iat": int(time.time()), "exp": int(time.time()) + 60}, SECRET, "HS256")
+
+    assert authenticator.authenticate(token) is None
+    user = authenticator.verify(token)
+    authenticator.remember(token, user)
+    assert authenticator.authenticate(token) == user
+
+    authenticator.revocations.revoke_token("t1", user.expires_at)
+    with pytest.raises(InvalidToken):
+        authenticator.authenticate(token)
+    with pytest.raises(InvalidToken):
+        authenticator.verify("not a token")
+
+
+def test_logout_revokes_only_that_token(client, signup):
+    email, first = signup()
+    second = {"Authorization": "Bearer " + client.post("/api/auth/login", json={"email": email, "password": "pw123456"}).json()["access_token"]}
+
+    assert client.post("/api/auth/logout", headers=first).status_code == 200
+    assert client.get("/api/projects", headers=first).status_code == 401
+    assert client.get("/api/projects", headers=second).status_code == 200
+
+
+def test_login_right_after_logout_all_is_valid(client, signup):
+    email, first = signup()
+    second = {"Authorization": "Bearer " + client.post("/api/auth/login", json={"email": email, "password": "pw123456"}).json()["access_token"]}
+    # Make sure the existing tokens were issued in an earlier second than the cut-off
+    time.sleep(1.0)
+
+    assert client.post("/api/auth/logout-all", headers=first).status_code == 200
+    fresh = {"Authorization": "Bearer " + client.post("/api/auth/login", json={"email": email, "password": "pw123456"}).json()["access_token"]}
+
+    assert client.get("/api/projects", headers=first).status_code == 401
+    assert client.get("/api/projects", headers=second).status_code == 401
+    assert client.get("/api/projects", headers=fresh).status_code == 200
+
+
+def test_purge_drops_only_revocations_that_can_no_longer_match(server_module):
+    server = server_module
+    now = time.time()
+    lifetime = server.ACCESS_TOKEN_LIFETIME.total_seconds()
+    rows = {
+        "expired-token": dict(user_id="u1", expires_at=now - 1),
+        "live-token": dict(user_id="u1", expires_at=now + 60),
+        "user:old": dict(user_id="old", revoked_before=now - lifetime - 60),
+        "user:recent": dict(user_id="recent", revoked_before=now - 60),
+    }
+    db = server.SessionLocal()
+    try:
+        for row_id, values in rows.items():
+            db.merge(server.RevokedTokenDB(id=row_id, revoked_at=now, **values))
+        db.commit()
+    finally:
+        db.close()
+
+    assert server.purge_revoked_tokens() == 2
+    db = server.SessionLocal()
+    try:
+        left = {row.id for row in db.query(server.RevokedTokenDB).filter(server.RevokedTokenDB.id.in_(rows))}
+    finally:
+        db.close()
+    assert left == {"live-token", "user:recent"}
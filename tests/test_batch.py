@@ -0,0 +1,153 @@
+import asyncio
+import time
+
+import pytest
+
+import batch
+from batch import RateBudget, TokenBucket
+
+
+class FakeClock:
+    """Stands in for time.monotonic and asyncio.sleep, so pacing is exact and instant"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(batch.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(batch.asyncio, "sleep", fake.sleep)
+    return fake
+
+
+def test_token_bucket_refills_at_its_rate(clock):
+    bucket = TokenBucket(per_minute=60)
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+
+    clock.now += 30
+    assert bucket.wait_time(30) == 0.0
+    assert bucket.wait_time(31) == pytest.approx(1.0)
+
+
+def test_token_bucket_caps_oversized_requests(clock):
+    bucket = TokenBucket(per_minute=60)
+    bucket.take(60)
+    # Asking for more than the bucket holds waits for a full bucket, not forever
+    assert bucket.wait_time(1000) == pytest.approx(60.0)
+
+
+def test_rate_budget_paces_requests_per_minute(clock):
+    budget = RateBudget(requests_per_minute=120, tokens_per_minute=1_000_000)
+    started = clock.now
+
+    async def scenario():
+        for _ in range(125):
+            await budget.acquire(10)
+
+    asyncio.run(scenario())
+
+    # The first 120 go out in a burst, then one every half second
+    assert clock.now - started == pytest.approx(2.5)
+    assert clock.sleeps == [pytest.approx(0.5)] * 5
+
+
+def test_rate_budget_paces_tokens_per_minute(clock):
+    budget = RateBudget(requests_per_minute=1000, tokens_per_minute=600)
+    started = clock.now
+
+    async def scenario():
+        for _ in range(4):
+            await budget.acquire(300)
+
+    asyncio.run(scenario())
+
+    # 600 tokens up front, then 300 more every 30 seconds
+    assert clock.now - started == pytest.approx(60.0)
+
+
+def test_rate_budget_grants_in_arrival_order(clock):
+    budget = RateBudget(requests_per_minute=60, tokens_per_minute=1_000_000)
+    budget.requests.take(60)
+    granted = []
+
+    async def caller(name):
+        await budget.acquire(1)
+        granted.append(name)
+
+    async def scenario():
+        await asyncio.gather(*(caller(i) for i in range(5)))
+
+    asyncio.run(scenario())
+
+    assert granted == [0, 1, 2, 3, 4]
+
+
+def test_settle_corrects_the_estimate(clock):
+    budget = RateBudget(requests_per_minute=1000, tokens_per_minute=1000)
+
+    async def scenario():
+        await budget.acquire(100)
+
+    asyncio.run(scenario())
+    assert budget.tokens.tokens == pytest.approx(900)
+
+    # The call used more than estimated: the overrun is charged
+    budget.settle(100, 400)
+    assert budget.tokens.tokens == pytest.approx(600)
+
+    # ...and less than estimated: the surplus is refunded
+    budget.settle(100, 40)
+    assert budget.tokens.tokens == pytest.approx(660)
+
+    # Unknown usage leaves the estimate in place
+    budget.settle(100, None)
+    assert budget.tokens.tokens == pytest.approx(660)
+
+
+def test_estimate_tokens():
+    assert batch.estimate_tokens("") == 1
+    assert batch.estimate_tokens("x" * 400) == 100
+
+
+def test_batch_job_completes_around_a_failing_item(client, signup, server_module, monkeypatch):
+    _, headers = signup()
+    project_ids = [client.post("/api/projects", json={"name": f"p{i}"}, headers=headers).json()["id"] for i in range(5)]
+
+    async def generate_batch_item(item, fresh, user_id):
+        if item["product_type"] == "broken":
+            raise RuntimeError("disk I/O error")
+        return {"title": f"Title for {item['product_type']}", "description": "Copy"}, False
+
+    monkeypatch.setattr(server_module, "text_providers", [object()])
+    monkeypatch.setattr(server_module, "generate_batch_item", generate_batch_item)
+    monkeypatch.setattr(server_module, "BATCH_FLUSH_SECONDS", 0.05)
+
+    items = [{"project_id": pid, "product_type": "broken" if i == 2 else f"type {i}"} for i, pid in enumerate(project_ids)]
+    response = client.post("/api/content/generate/batch", json={"items": items}, headers=headers)
+    assert response.status_code == 202, response.text
+    job_id = response.json()["job_id"]
+
+    deadline = time.monotonic() + 5
+    while True:
+        job = client.get(f"/api/content/batch/{job_id}", headers=headers).json()
+        if job["status"] != "running" or time.monotonic() > deadline:
+            break
+        time.sleep(0.02)
+
+    assert job["status"] == "completed"
+    assert (job["succeeded"], job["failed"], job["pending"]) == (4, 1, 0)
+    assert [item["status"] for item in job["items"]] == ["succeeded", "succeeded", "failed", "succeeded", "succeeded"]
+    assert "disk I/O error" in job["items"][2]["error"]
+    assert client.get(f"/api/projects/{project_ids[3]}", headers=headers).json()["ai_title"] == "Title for type 3"
+    assert client.get(f"/api/projects/{project_ids[2]}", headers=headers).json()["ai_title"] in (None, "")
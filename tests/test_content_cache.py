@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from content_cache import CacheStats, fingerprint, normalize_features, normalize_text
+
+
+def test_normalize_text_folds_case_and_whitespace():
+    assert normalize_text("  Leather\tWallet \n ") == "leather wallet"
+    assert normalize_text(None) == ""
+
+
+@pytest.mark.parametrize("features", [
+    "waterproof, slim fit; RFID blocking",
+    "RFID blocking\nwaterproof,slim fit",
+    "- Waterproof.\n* slim   fit\n• rfid blocking\n\n",
+    "slim fit, waterproof, waterproof, rfid blocking,,",
+])
+def test_normalize_features_ignores_order_punctuation_and_duplicates(features):
+    assert normalize_features(features) == ["rfid blocking", "slim fit", "waterproof"]
+
+
+def test_normalize_features_empty():
+    assert normalize_features(None) == []
+    assert normalize_features(" ,; \n") == []
+
+
+def test_fingerprint_is_stable_across_equivalent_inputs():
+    a = fingerprint("Leather Wallet", "slim fit, waterproof", "model-a", "v1")
+    b = fingerprint("  leather   WALLET", "Waterproof;\nslim fit.", "model-a", "v1")
+    assert a == b
+    assert len(a) == 64
+
+
+@pytest.mark.parametrize("changed", [
+    ("Canvas Wallet", "slim fit, waterproof", "model-a", "v1"),
+    ("Leather Wallet", "slim fit", "model-a", "v1"),
+    ("Leather Wallet", "slim fit, waterproof", "model-b", "v1"),
+    ("Leather Wallet", "slim fit, waterproof", "model-a", "v2"),
+])
+def test_fingerprint_changes_with_product_model_and_prompt_version(changed):
+    assert fingerprint(*changed) != fingerprint("Leather Wallet", "slim fit, waterproof", "model-a", "v1")
+
+
+def test_fingerprint_does_not_confuse_product_and_features():
+    assert fingerprint("wallet", "leather", "m", "v1") != fingerprint("leather", "wallet", "m", "v1")
+
+
+def test_cache_stats_hit_rate():
+    stats = CacheStats()
+    assert stats.snapshot()["hit_rate"] == 0.0
+    stats.hits, stats.misses = 3, 1
+    assert stats.snapshot()["hit_rate"] == 0.75
+
+
+def test_store_cached_content_overwrites_existing_key(server_module):
+    key = os.urandom(16).hex()
+    server_module.store_cached_content(server_module.SessionLocal(), key, {"title": "First", "description": "one"})
+    # A second worker finishing the same generation must not raise
+    server_module.store_cached_content(server_module.SessionLocal(), key, {"title": "Second", "description": "two"})
+
+    assert server_module.lookup_cached_content(key) == {"title": "Second", "description": "two"}
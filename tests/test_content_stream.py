@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from content_stream import SectionParser
+
+COMPLETIONS = {
+    "plain": (
+        "TITLE: Hand-Thrown Ceramic Mug\nDESCRIPTION: A 12 oz mug,  glazed by hand.\n\nDishwasher safe.",
+        {"title": "Hand-Thrown Ceramic Mug", "description": "A 12 oz mug,  glazed by hand.\n\nDishwasher safe."},
+    ),
+    "padding": (
+        "\n TITLE:   Linen Apron  \n\n  DESCRIPTION:\n  Stonewashed linen. \n",
+        {"title": "Linen Apron", "description": "Stonewashed linen."},
+    ),
+    "marker_text_in_description": (
+        "TITLE: Notebook\nDESCRIPTION: Write TITLE: anywhere, even DESCRIPTION: lines.",
+        {"title": "Notebook", "description": "Write TITLE: anywhere, even DESCRIPTION: lines."},
+    ),
+    "no_description": (
+        "TITLE: Just a title  ",
+        {"title": "Just a title", "description": None},
+    ),
+}
+
+
+def fixed(size):
+    return lambda text: [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def at_markers(text):
+    """Split right inside every marker, e.g. "DESCRIP" | "TION:" """
+    cuts = sorted({0, len(text)} | {i + 4 for i in range(len(text)) if text.startswith(("TITLE:", "DESCRIPTION:"), i)})
+    return [text[a:b] for a, b in zip(cuts, cuts[1:])]
+
+
+def random_sizes(seed):
+    def split(text):
+        rng = random.Random(seed)
+        chunks, i = [], 0
+        while i < len(text):
+            size = rng.randint(1, 9)
+            chunks.append(text[i:i + size])
+            i += size
+        return chunks
+
+    return split
+
+
+CHUNKINGS = {
+    "whole": lambda text: [text],
+    "chars": fixed(1),
+    "pairs": fixed(2),
+    "sevens": fixed(7),
+    "at_markers": at_markers,
+    "random_1": random_sizes(1),
+    "random_2": random_sizes(2),
+    "with_empty_chunks": lambda text: [piece for c in fixed(3)(text) for piece in (c, "")],
+}
+
+
+def parse(chunks):
+    parser = SectionParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    events.extend(parser.close())
+    return events
+
+
+def coalesce(events):
+    """Merge consecutive deltas of the same section; chunking only changes where deltas break"""
+    merged = []
+    for section, text in events:
+        assert text, "empty deltas should never be emitted"
+        if merged and merged[-1][0] == section:
+            merged[-1] = (section, merged[-1][1] + text)
+        else:
+            merged.append((section, text))
+    return merged
+
+
+@pytest.mark.parametrize("chunking", CHUNKINGS)
+@pytest.mark.parametrize("completion", COMPLETIONS)
+def test_chunking_does_not_change_events(completion, chunking):
+    text, expected = COMPLETIONS[completion]
+    chunks = CHUNKINGS[chunking](text)
+    assert "".join(chunks) == text
+
+    events = coalesce(parse(chunks))
+
+    assert events == coalesce(parse([text]))
+    assert events == [(section, expected[section]) for section in ("title", "description") if expected[section] is not None]
@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, Float, Integer, LargeBinary, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+from idempotency import IdempotencyStore
+
+Base = declarative_base()
+
+
+class IdempotencyKey(Base):
+    # Same columns as server.IdempotencyKeyDB
+    __tablename__ = "idempotency_keys"
+
+    id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=False)
+    fingerprint = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response = Column(LargeBinary, nullable=True)
+    created_at = Column(Float, nullable=False)
+    expires_at = Column(Float, nullable=False, index=True)
+
+
+@pytest.fixture
+def store():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return IdempotencyStore(sessionmaker(bind=engine), IdempotencyKey, wait_seconds=0.2, poll_interval=0.01)
+
+
+def make_request(key=None, path="/api/content/generate"):
+    headers = [(b"idempotency-key", key.encode())] if key is not None else []
+    return Request({"type": "http", "method": "POST", "path": path, "headers": headers, "query_string": b""})
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return {"call": self.calls}
+
+
+def test_replays_the_first_response(store):
+    compute = Counter()
+
+    async def scenario():
+        first = await store.run(make_request("k1"), "u1", "payload", compute)
+        second = await store.run(make_request("k1"), "u1", "payload", compute)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert compute.calls == 1
+    assert json.loads(first.body) == json.loads(second.body) == {"call": 1}
+    assert second.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert store.stats()["replayed"] == 1
+
+
+def test_keys_are_scoped_per_user_and_optional(store):
+    compute = Counter()
+
+    async def scenario():
+        await store.run(make_request("k1"), "u1", "payload", compute)
+        await store.run(make_request("k1"), "u2", "payload", compute)
+        await store.run(make_request(), "u1", "payload", compute)
+        await store.run(make_request(), "u1", "payload", compute)
+
+    asyncio.run(scenario())
+    assert compute.calls == 4
+
+
+def test_different_payload_with_same_key_is_rejected(store):
+    compute = Counter()
+
+    async def scenario():
+        await store.run(make_request("k1"), "u1", "payload", compute)
+        await store.run(make_request("k1"), "u1", "other payload", compute)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 422
+    assert compute.calls == 1
+
+
+def test_conflict_while_first_request_is_still_running(store):
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return {"done": True}
+
+        first = asyncio.create_task(store.run(make_request("k1"), "u1", "payload", slow))
+        await asyncio.sleep(0.02)
+        try:
+            with pytest.raises(HTTPException) as error:
+                await store.run(make_request("k1"), "u1", "payload", Counter())
+        finally:
+            release.set()
+        await first
+        return error.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 409
+    assert error.headers["Retry-After"] == "1"
+    assert store.stats()["conflicts"] == 1
+
+
+def test_waiting_retry_gets_the_result_once_the_first_finishes(store):
+    compute = Counter()
+
+    async def scenario():
+        async def slow():
+            await asyncio.sleep(0.05)
+            return await compute()
+
+        return await asyncio.gather(
+            store.run(make_request("k1"), "u1", "payload", slow),
+            store.run(make_request("k1"), "u1", "payload", slow),
+        )
+
+    responses = asyncio.run(scenario())
+    assert compute.calls == 1
+    assert [json.loads(r.body) for r in responses] == [{"call": 1}, {"call": 1}]
+
+
+def test_failed_request_releases_the_key(store):
+    compute = Counter()
+
+    async def failing():
+        raise RuntimeError("provider down")
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await store.run(make_request("k1"), "u1", "payload", failing)
+        return await store.run(make_request("k1"), "u1", "payload", compute)
+
+    response = asyncio.run(scenario())
+    assert compute.calls == 1
+    assert json.loads(response.body) == {"call": 1}
+    assert "idempotent-replayed" not in response.headers
+
+
+def test_invalid_key_is_rejected(store):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(store.run(make_request("x" * 256), "u1", "payload", Counter()))
+    assert error.value.status_code == 400
+
+
+def test_expired_claim_of_a_dead_worker_is_taken_over(store):
+    store.lock_seconds = 0.05
+    compute = Counter()
+    # A worker that claimed the key and died before completing or releasing it
+    request = make_request("k1")
+    record_id = hashlib.sha256(f"u1\0POST\0{request.url.path}\0k1".encode()).hexdigest()
+    assert store._claim(record_id, "u1", "payload") is None
+
+    async def scenario():
+        await asyncio.sleep(0.1)
+        return await store.run(make_request("k1"), "u1", "payload", compute)
+
+    response = asyncio.run(scenario())
+    assert compute.calls == 1
+    assert json.loads(response.body) == {"call": 1}
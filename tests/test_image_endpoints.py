@@ -0,0 +1,83 @@
+from io import BytesIO
+
+import pytest
+
+
+def jpeg(width=64, height=48) -> bytes:
+    from PIL import Image
+
+    out = BytesIO()
+    Image.new("RGB", (width, height), (250, 250, 250)).save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+
+@pytest.fixture
+def headers(signup):
+    return signup()[1]
+
+
+def test_raw_image_is_processed(client, headers):
+    response = client.post("/api/image/remove-background", content=jpeg(), headers={**headers, "Content-Type": "image/jpeg"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+
+
+@pytest.mark.parametrize("body", [
+    jpeg(400, 300)[:600],
+    b"\xff\xd8\xff\xe0" + b"\x00" * 200,
+    b"definitely not an image",
+], ids=["truncated", "corrupt_header", "garbage"])
+@pytest.mark.parametrize("path", ["/api/image/remove-background", "/api/image/enhance"])
+def test_undecodable_raw_body_is_rejected(client, headers, path, body):
+    response = client.post(path, content=body, headers={**headers, "Content-Type": "image/jpeg"})
+
+    assert response.status_code == 400
+
+
+def test_truncated_multipart_upload_is_rejected(client, headers):
+    files = {"file": ("photo.jpg", jpeg(400, 300)[:600], "image/jpeg")}
+    response = client.post("/api/image/enhance", files=files, headers=headers)
+
+    assert response.status_code == 400
+
+
+def test_multipart_upload_is_processed(client, headers):
+    response = client.post("/api/image/enhance", files={"file": ("photo.jpg", jpeg(), "image/jpeg")}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/jpeg"
+
+
+def test_multipart_without_file_field_is_rejected(client, headers):
+    response = client.post("/api/image/enhance", data={"note": "no image"}, files={"other": ("a.txt", b"x", "text/plain")}, headers=headers)
+
+    assert response.status_code == 400
+
+
+def test_multipart_body_over_the_cap_is_refused(client, headers, server_module, monkeypatch):
+    monkeypatch.setattr(server_module, "MAX_IMAGE_UPLOAD_BYTES", 32 * 1024)
+    monkeypatch.setattr(server_module, "MULTIPART_OVERHEAD_BYTES", 1024)
+    files = {"file": ("big.bin", b"\x00" * (256 * 1024), "application/octet-stream")}
+
+    response = client.post("/api/image/enhance", files=files, headers=headers)
+
+    assert response.status_code == 413
+
+
+def test_raw_body_over_the_cap_is_refused(client, headers, server_module, monkeypatch):
+    monkeypatch.setattr(server_module, "MAX_IMAGE_UPLOAD_BYTES", 32 * 1024)
+
+    response = client.post("/api/image/enhance", content=b"\x00" * (64 * 1024), headers={**headers, "Content-Type": "image/jpeg"})
+
+    assert response.status_code == 413
+
+
+@pytest.mark.parametrize("content_type, body", [
+    ("multipart/form-data; boundary=xyz", b"garbage\r\n--xyz\r\nbroken"),
+    ("multipart/form-data", b"no boundary"),
+], ids=["bad_framing", "missing_boundary"])
+def test_malformed_multipart_is_rejected(client, headers, content_type, body):
+    response = client.post("/api/image/enhance", content=body, headers={**headers, "Content-Type": content_type})
+
+    assert response.status_code == 400
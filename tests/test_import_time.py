@@ -0,0 +1,23 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+# Heavy or optional libraries that must only load on first use, never at server startup
+LAZY_MODULES = ["PIL", "google.generativeai", "emergentintegrations", "httpx", "numpy"]
+
+
+def test_server_import_leaves_heavy_dependencies_unloaded(tmp_path):
+    script = (
+        "import json, sys\n"
+        "import server\n"
+        f"print(json.dumps([name for name in {LAZY_MODULES!r} if name in sys.modules]))\n"
+    )
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path}/import.db", "UPLOAD_DIR": str(tmp_path / "uploads")}
+    result = subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+SCRIPT = """
+import sys
+sys.modules["orjson"] = None  # as if it weren't installed
+
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+import server
+
+assert server.FastJSONResponse is not ORJSONResponse
+with TestClient(server.app) as client:
+    token = client.post("/api/auth/signup", json={"email": "fallback@example.com", "password": "pw123456"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    project = client.post("/api/projects", json={"name": "Mug"}, headers=headers)
+    assert project.status_code == 200, project.text
+    listed = client.get("/api/projects", headers=headers)
+    assert listed.status_code == 200, listed.text
+    assert listed.json()[0]["created_at"] == project.json()["created_at"]
+    fetched = client.get(f"/api/projects/{project.json()['id']}", headers=headers)
+    assert fetched.status_code == 200, fetched.text
+print("ok")
+"""
+
+
+def test_project_responses_serialize_without_orjson(tmp_path):
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path}/fallback.db", "UPLOAD_DIR": str(tmp_path / "uploads")}
+    result = subprocess.run([sys.executable, "-c", SCRIPT], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("ok")
@@ -0,0 +1,145 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import llm_client
+from llm_client import LLMClient, LLMError
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def completion(text="ok"):
+    return {"model": "m", "choices": [{"message": {"content": text}}], "usage": {"total_tokens": 3}}
+
+
+def make_client(responses, **kwargs):
+    """A client whose transport replays responses in order and records each request"""
+    requests = []
+    queue = list(responses)
+
+    def handler(request):
+        requests.append(request)
+        return queue.pop(0)
+
+    kwargs.setdefault("backoff_base", 0.01)
+    return LLMClient("http://llm.test/v1", "key", transport=httpx.MockTransport(handler), **kwargs), requests
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of waiting them out"""
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(llm_client.asyncio, "sleep", sleep)
+    return delays
+
+
+def run(client, coro):
+    async def scenario():
+        try:
+            return await coro
+        finally:
+            await client.aclose()
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503])
+def test_chat_retries_retryable_status(sleeps, status):
+    client, requests = make_client([httpx.Response(status), httpx.Response(200, json=completion("done"))])
+
+    result = run(client, client.chat("m", MESSAGES))
+
+    assert result.text == "done"
+    assert result.attempts == 2
+    assert len(requests) == 2
+    assert requests[0].headers["authorization"] == "Bearer key"
+    assert json.loads(requests[0].content) == {"model": "m", "messages": MESSAGES}
+
+
+def test_chat_honours_retry_after(sleeps):
+    client, _ = make_client([
+        httpx.Response(429, headers={"Retry-After": "2"}),
+        httpx.Response(503, headers={"Retry-After": "30"}),
+        httpx.Response(200, json=completion()),
+    ], backoff_cap=5.0)
+
+    result = run(client, client.chat("m", MESSAGES))
+
+    assert result.attempts == 3
+    # Retry-After is used as-is, but never beyond the backoff cap
+    assert sleeps == [2.0, 5.0]
+
+
+@pytest.mark.parametrize("status", [400, 401, 404, 422])
+def test_chat_does_not_retry_client_errors(sleeps, status):
+    client, requests = make_client([httpx.Response(status, text="bad request"), httpx.Response(200, json=completion())])
+
+    with pytest.raises(LLMError) as error:
+        run(client, client.chat("m", MESSAGES))
+
+    assert error.value.status_code == status
+    assert len(requests) == 1
+    assert sleeps == []
+
+
+def test_chat_gives_up_after_max_retries(sleeps):
+    client, requests = make_client([httpx.Response(500)] * 3, max_retries=2)
+
+    with pytest.raises(LLMError) as error:
+        run(client, client.chat("m", MESSAGES))
+
+    assert error.value.status_code == 500
+    assert len(requests) == 3
+
+
+def test_chat_rejects_malformed_response(sleeps):
+    client, _ = make_client([httpx.Response(200, json={"choices": []})])
+
+    with pytest.raises(LLMError, match="Malformed"):
+        run(client, client.chat("m", MESSAGES))
+
+
+def sse(*events):
+    return "".join(f"data: {event}\n\n" for event in events).encode()
+
+
+def chunk(content=None):
+    delta = {} if content is None else {"content": content}
+    return json.dumps({"choices": [{"delta": delta}]})
+
+
+def collect(client, **kwargs):
+    async def deltas():
+        return [delta async for delta in client.stream_chat("m", MESSAGES, **kwargs)]
+
+    return run(client, deltas())
+
+
+def test_stream_chat_yields_content_deltas(sleeps):
+    body = b": keep-alive\n\n" + sse(chunk(), chunk("TITLE: "), chunk("Mug"), chunk(""), chunk("\nDESCRIPTION: Hot"), "[DONE]", chunk("ignored"))
+    client, requests = make_client([httpx.Response(200, content=body, headers={"Content-Type": "text/event-stream"})])
+
+    assert collect(client) == ["TITLE: ", "Mug", "\nDESCRIPTION: Hot"]
+    assert json.loads(requests[0].content)["stream"] is True
+
+
+def test_stream_chat_retries_before_first_chunk(sleeps):
+    client, requests = make_client([httpx.Response(503), httpx.Response(200, content=sse(chunk("a"), chunk("b"), "[DONE]"))])
+
+    assert collect(client) == ["a", "b"]
+    assert len(requests) == 2
+
+
+def test_stream_chat_rejects_malformed_chunk(sleeps):
+    client, _ = make_client([httpx.Response(200, content=sse(chunk("a"), "{not json"))])
+
+    with pytest.raises(LLMError, match="Malformed"):
+        collect(client)
@@ -0,0 +1,45 @@
+from sqlalchemy import text
+
+from metrics import Registry
+
+
+def wait_samples(server_module):
+    """Observations so far: the histogram keeps per-bucket counts followed by the sum"""
+    return sum(sum(state[:-1]) for state in server_module.DB_POOL_WAIT._values.values())
+
+
+def test_pool_wait_is_recorded_after_the_pool_is_recreated(server_module):
+    before = wait_samples(server_module)
+    server_module.engine.dispose()
+
+    db = server_module.SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 1"))
+        db.commit()
+        db.execute(text("SELECT 1"))
+    finally:
+        db.close()
+
+    # One checkout per transaction, not per statement
+    assert wait_samples(server_module) == before + 2
+
+
+def test_counter_mirrors_a_running_total():
+    registry = Registry()
+    events = registry.counter("pool_events_total", "Events", ["event"])
+    events.set_total(3, event="hedge")
+    events.set_total(5, event="hedge")
+
+    assert registry.render().splitlines() == [
+        "# HELP pool_events_total Events",
+        "# TYPE pool_events_total counter",
+        'pool_events_total{event="hedge"} 5',
+    ]
+
+
+def test_provider_events_are_exported_as_a_counter(client):
+    body = client.get("/metrics").text
+
+    assert "# TYPE ai_provider_pool_events_total counter" in body
+    assert 'ai_provider_pool_events_total{kind="text",event="hedge"} 0' in body
@@ -0,0 +1,32 @@
+def test_project_list_revalidates_with_etag(client, signup):
+    _, headers = signup()
+    ids = [client.post("/api/projects", json={"name": f"p{i}"}, headers=headers).json()["id"] for i in range(3)]
+
+    first = client.get("/api/projects", headers=headers)
+    etag = first.headers["etag"]
+    assert "last-modified" not in first.headers
+
+    unchanged = client.get("/api/projects", headers={**headers, "If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    # Deleting a project that isn't the most recently updated leaves max(updated_at) alone
+    client.delete(f"/api/projects/{ids[0]}", headers=headers)
+    after_delete = client.get("/api/projects", headers={**headers, "If-None-Match": etag})
+    assert after_delete.status_code == 200
+    assert len(after_delete.json()) == 2
+
+    # An edit within the same second as the last one still changes the ETag
+    client.put(f"/api/projects/{ids[1]}", json={"name": "renamed"}, headers=headers)
+    after_edit = client.get("/api/projects", headers={**headers, "If-None-Match": after_delete.headers["etag"]})
+    assert after_edit.status_code == 200
+    assert "renamed" in {p["name"] for p in after_edit.json()}
+
+
+def test_project_list_ignores_if_modified_since(client, signup):
+    _, headers = signup()
+    client.post("/api/projects", json={"name": "p"}, headers=headers)
+
+    response = client.get("/api/projects", headers={**headers, "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert response.status_code == 200
+    assert len(response.json()) == 1
@@ -0,0 +1,193 @@
+import asyncio
+
+import pytest
+
+from llm_client import ChatResult
+from providers import LatencyTracker, ProviderError, ProviderPool, TextProvider
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class ScriptedProvider(TextProvider):
+    """Answers after a fixed delay, or fails; delay=None never answers until cancelled"""
+
+    def __init__(self, name, delay=0.0, error=None, chunks=("a", "b", "c"), fail_after=None):
+        super().__init__()
+        self.name = name
+        self.model = f"scripted-{name}"
+        self.delay = delay
+        self.error = error
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.calls = 0
+        self.cancelled = 0
+
+    async def complete(self, messages):
+        self.calls += 1
+        try:
+            if self.delay is None:
+                await asyncio.Event().wait()
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise ProviderError(self.error)
+        return ChatResult(text=self.name, model=self.model)
+
+    async def stream(self, messages):
+        self.calls += 1
+        if self.error and self.fail_after is None:
+            raise ProviderError(self.error)
+        for position, chunk in enumerate(self.chunks):
+            if self.fail_after == position:
+                raise ProviderError(self.error or "stream broke")
+            yield chunk
+
+
+def make_pool(*providers, **kwargs):
+    events = []
+    kwargs.setdefault("hedge_default_delay", 0.05)
+    pool = ProviderPool(list(providers), observer=lambda p, outcome, _: events.append((p.name, outcome)), **kwargs)
+    return pool, events
+
+
+def call(pool):
+    async def scenario():
+        result, provider = await pool.call(lambda p: p.complete(MESSAGES))
+        # Let the cancelled loser run its cancellation handlers
+        await asyncio.sleep(0)
+        return result.text, provider.name
+
+    return asyncio.run(scenario())
+
+
+def test_primary_answers_without_hedging():
+    primary, backup = ScriptedProvider("primary"), ScriptedProvider("backup")
+    pool, events = make_pool(primary, backup)
+
+    assert call(pool) == ("primary", "primary")
+    assert backup.calls == 0
+    assert (pool.hedges, pool.hedge_wins, pool.fallbacks) == (0, 0, 0)
+    assert events == [("primary", "ok")]
+
+
+def test_hedge_fires_after_delay_and_wins():
+    primary, backup = ScriptedProvider("primary", delay=None), ScriptedProvider("backup")
+    pool, events = make_pool(primary, backup)
+
+    assert call(pool) == ("backup", "backup")
+    assert (pool.hedges, pool.hedge_wins) == (1, 1)
+    assert backup.calls == 1
+
+
+def test_hedge_loser_is_cancelled_and_recorded():
+    primary, backup = ScriptedProvider("primary", delay=None), ScriptedProvider("backup")
+    pool, events = make_pool(primary, backup)
+
+    call(pool)
+
+    assert primary.cancelled == 1
+    assert sorted(events) == [("backup", "ok"), ("primary", "cancelled")]
+    # The loser's elapsed time counts as a latency sample, at least the hedge delay
+    assert len(primary.tracker.latencies) == 1
+    assert primary.tracker.latencies[0] >= 0.05
+    assert primary.tracker.consecutive_failures == 0
+
+
+def test_no_hedge_when_disabled():
+    primary, backup = ScriptedProvider("primary", delay=0.1), ScriptedProvider("backup")
+    pool, _ = make_pool(primary, backup, hedging=False)
+
+    assert call(pool) == ("primary", "primary")
+    assert backup.calls == 0
+
+
+def test_hedge_delay_follows_tracked_p95():
+    provider = ScriptedProvider("p")
+    pool, _ = make_pool(provider, hedge_min_samples=10, hedge_min_delay=0.01)
+    assert pool.hedge_delay(provider) == pool.hedge_default_delay
+
+    for latency in [0.1] * 18 + [2.0] * 2:
+        provider.tracker.record_success(latency)
+    assert pool.hedge_delay(provider) == 2.0
+
+
+def test_error_falls_through_immediately():
+    primary, backup = ScriptedProvider("primary", error="boom"), ScriptedProvider("backup")
+    pool, events = make_pool(primary, backup, hedge_default_delay=10.0)
+
+    assert call(pool) == ("backup", "backup")
+    assert (pool.hedges, pool.fallbacks) == (0, 1)
+    assert events == [("primary", "error"), ("backup", "ok")]
+    assert primary.tracker.consecutive_failures == 1
+
+
+def test_all_providers_failing_raises_with_every_error():
+    pool, _ = make_pool(ScriptedProvider("a", error="first"), ScriptedProvider("b", error="second"))
+
+    with pytest.raises(ProviderError) as error:
+        call(pool)
+
+    assert "a: first" in str(error.value) and "b: second" in str(error.value)
+
+
+def test_unhealthy_provider_is_ranked_last():
+    primary, backup = ScriptedProvider("primary"), ScriptedProvider("backup")
+    for _ in range(3):
+        primary.tracker.record_failure()
+    pool, _ = make_pool(primary, backup)
+
+    assert pool.names == ["primary", "backup"]
+    assert [p.name for p in pool.ranked()] == ["backup", "primary"]
+    assert call(pool) == ("backup", "backup")
+
+
+def test_tracker_recovers_after_cooldown(monkeypatch):
+    tracker = LatencyTracker(cooldown=30.0)
+    for _ in range(3):
+        tracker.record_failure()
+    assert not tracker.healthy
+
+    monkeypatch.setattr("providers.time.monotonic", lambda: tracker.failed_at + 31)
+    assert tracker.healthy
+
+
+def collect(pool):
+    meta = {}
+
+    async def scenario():
+        chunks = []
+        try:
+            async for delta in pool.stream(MESSAGES, meta):
+                chunks.append(delta)
+        except ProviderError as e:
+            return chunks, meta["provider"].name, e
+        return chunks, meta["provider"].name, None
+
+    return asyncio.run(scenario())
+
+
+def test_stream_falls_back_before_first_chunk():
+    primary, backup = ScriptedProvider("primary", error="refused"), ScriptedProvider("backup", chunks=("x", "y"))
+    pool, events = make_pool(primary, backup)
+
+    assert collect(pool) == (["x", "y"], "backup", None)
+    assert pool.fallbacks == 1
+    assert events == [("primary", "error"), ("backup", "ok")]
+
+
+def test_stream_does_not_fall_back_after_first_chunk():
+    primary = ScriptedProvider("primary", error="dropped", chunks=("a", "b", "c"), fail_after=2)
+    backup = ScriptedProvider("backup")
+    pool, events = make_pool(primary, backup)
+
+    chunks, provider, error = collect(pool)
+
+    # Switching providers mid-stream would splice two different completions
+    assert chunks == ["a", "b"]
+    assert provider == "primary"
+    assert "dropped" in str(error)
+    assert backup.calls == 0
+    assert pool.fallbacks == 0
+    assert events == [("primary", "error")]
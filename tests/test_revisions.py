@@ -0,0 +1,37 @@
+from revisions import DELTA, SNAPSHOT, SNAPSHOT_INTERVAL, decode_revisions, encode_revision
+
+
+def encode_history(history):
+    chain, previous = [], None
+    for number, content in enumerate(history, start=1):
+        chain.append(encode_revision(number, content, previous))
+        previous = content
+    return chain
+
+
+def test_round_trip_across_snapshot_boundary():
+    history = [
+        {"ai_title": f"Bottle v{i}", "ai_description": "Keeps drinks cold. " * i + f"Edit {i}."}
+        for i in range(1, 2 * SNAPSHOT_INTERVAL + 3)
+    ]
+    chain = encode_history(history)
+
+    for number, content in enumerate(history, start=1):
+        first = ((number - 1) // SNAPSHOT_INTERVAL) * SNAPSHOT_INTERVAL + 1
+        assert chain[first - 1][0] == SNAPSHOT
+        assert decode_revisions(chain[first - 1:number]) == content
+    assert [kind for kind, _ in chain[:SNAPSHOT_INTERVAL + 1]] == [SNAPSHOT] + [DELTA] * (SNAPSHOT_INTERVAL - 1) + [SNAPSHOT]
+
+
+def test_round_trip_unicode_and_whitespace():
+    history = [
+        {"ai_title": "Café ☕ mug", "ai_description": "Line one\n\nLine  two\twith tabs"},
+        {"ai_title": "Café ☕ mug — 350 ml", "ai_description": "Línea uno\n\nLine  two\twith tabs 🚀"},
+        {"ai_title": "", "ai_description": "日本語の説明"},
+        {"ai_title": None, "ai_description": "日本語の説明、更新"},
+    ]
+    chain = encode_history(history)
+
+    for number, content in enumerate(history, start=1):
+        expected = {field: value or "" for field, value in content.items()}
+        assert decode_revisions(chain[:number]) == expected
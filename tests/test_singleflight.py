@@ -0,0 +1,167 @@
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+class MemoryBackend:
+    """RedisFlightBackend's interface over a dict, shared by SingleFlight instances standing in for workers"""
+
+    def __init__(self):
+        self.locks = {}
+        self.results = {}
+
+    async def acquire(self, key, ttl):
+        if key in self.locks:
+            return None
+        self.locks[key] = token = object()
+        return token
+
+    async def release(self, key, token):
+        if self.locks.get(key) is token:
+            del self.locks[key]
+
+    async def locked(self, key):
+        return key in self.locks
+
+    async def publish(self, key, result, ttl):
+        self.results[key] = result
+
+    async def result(self, key):
+        return self.results.get(key)
+
+    async def aclose(self):
+        pass
+
+
+def test_concurrent_callers_share_one_leader():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"title": "Mug"}
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert [result for result, _ in results] == [{"title": "Mug"}] * 5
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert (flight.leaders, flight.coalesced) == (1, 4)
+
+
+def test_different_keys_do_not_coalesce():
+    flight = SingleFlight()
+
+    async def scenario():
+        return await asyncio.gather(flight.do("a", lambda: asyncio.sleep(0.01, "a")), flight.do("b", lambda: asyncio.sleep(0.01, "b")))
+
+    assert asyncio.run(scenario()) == [("a", False), ("b", False)]
+    assert flight.leaders == 2
+
+
+def test_leader_exception_reaches_every_follower():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("provider down")
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("k", work) for _ in range(4)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) and str(result) == "provider down" for result in results)
+
+
+def test_key_is_freed_after_success_and_failure():
+    flight = SingleFlight()
+    outcomes = iter([ValueError("first"), "second", "third"])
+
+    async def work():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await flight.do("k", work)
+        assert flight.stats()["in_flight"] == 0
+        # Later calls run again instead of reusing the finished flight
+        assert await flight.do("k", work) == ("second", False)
+        assert await flight.do("k", work) == ("third", False)
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+    assert flight.leaders == 3
+
+
+def test_cancelled_leader_does_not_fail_followers():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def scenario():
+        leader = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        # The leader's client disconnects
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()) == ("done", True)
+
+
+def test_shared_backend_coalesces_across_workers():
+    backend = MemoryBackend()
+    workers = [SingleFlight(backend, poll_interval=0.001) for _ in range(3)]
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return {"title": "Mug"}
+
+    async def scenario():
+        return await asyncio.gather(*(worker.do("k", work) for worker in workers))
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert [result for result, _ in results] == [{"title": "Mug"}] * 3
+    assert sum(worker.remote_coalesced for worker in workers) == 2
+    assert backend.locks == {}
+
+
+def test_shared_backend_follower_takes_over_from_failed_leader():
+    backend = MemoryBackend()
+    leader, follower = SingleFlight(backend, poll_interval=0.001), SingleFlight(backend, poll_interval=0.001)
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("leader crashed")
+
+    async def work():
+        return "recovered"
+
+    async def scenario():
+        return await asyncio.gather(leader.do("k", failing), follower.do("k", work), return_exceptions=True)
+
+    first, second = asyncio.run(scenario())
+
+    assert isinstance(first, ValueError)
+    assert second == ("recovered", False)
+    assert backend.locks == {}